@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""Benchmark relay_sync.py against a local stand-in for the GitHub API."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib import parse
+
+import yaml
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_SCALES = "10,100,1000,5000"
+BENCH_REPO = "bench/relay"
+# Sleep floors are zeroed so a run measures request count and scheduling, not fixed pauses.
+BENCH_ENV_DEFAULTS = {
+    "RELAY_ISSUE_SYNC_SLEEP_SECONDS": "0",
+    "RELAY_API_MIN_INTERVAL_SECONDS": "0",
+    "RELAY_SEARCH_MIN_INTERVAL_SECONDS": "0",
+    "RELAY_CONTENT_CREATION_PER_MINUTE": "0",
+    "RELAY_API_BACKOFF_SECONDS": "0.1",
+}
+ISSUE_PATH = re.compile(r"^/repos/[^/]+/[^/]+/issues/\d+$")
+LABEL_PATH = re.compile(r"^/repos/[^/]+/[^/]+/labels/[^/]+$")
+GRAPHQL_MUTATION = re.compile(r"(m\d+): (createIssue|updateIssue)\(input: \$(\w+)\)")
+
+
+class FakeGitHub:
+    """In-memory issues and labels with just enough API surface for the relay."""
+
+    def __init__(self, rate_limit_every: int = 0, rate_limit_status: int = 429) -> None:
+        self.issues: dict[int, dict[str, Any]] = {}
+        self.labels: dict[str, dict[str, Any]] = {}
+        self.plan_ids: dict[str, list[int]] = {}
+        self.next_number = 1
+        self.version = 0
+        self.requests: dict[str, int] = {}
+        self.total_requests = 0
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_status = rate_limit_status
+        self.lock = threading.Lock()
+
+    def count(self, endpoint: str) -> bool:
+        """Record a request; return True when it should be answered with a rate-limit error."""
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.total_requests += 1
+            return self.rate_limit_every > 0 and self.total_requests % self.rate_limit_every == 0
+
+    def store_issue(self, issue: dict[str, Any]) -> None:
+        self.issues[issue["number"]] = issue
+        self.version += 1
+        match = re.search(r"(?im)^Plan-ID:\s*([^\s]+)\s*$", issue["body"] or "")
+        if match:
+            numbers = self.plan_ids.setdefault(match.group(1), [])
+            if issue["number"] not in numbers:
+                numbers.append(issue["number"])
+
+    def create_issue(self, title: str, body: str, labels: list[str]) -> dict[str, Any]:
+        issue = {
+            "number": self.next_number,
+            "node_id": f"I_{self.next_number}",
+            "title": title,
+            "body": body,
+            "state": "open",
+            "labels": [{"name": name} for name in labels],
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        self.next_number += 1
+        self.store_issue(issue)
+        return issue
+
+    def update_issue(self, number: int, fields: dict[str, Any]) -> dict[str, Any]:
+        issue = dict(self.issues[number])
+        for key in ("title", "body", "state"):
+            if key in fields:
+                issue[key] = fields[key]
+        if "labels" in fields:
+            issue["labels"] = [{"name": name} for name in fields["labels"]]
+        issue["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self.store_issue(issue)
+        return issue
+
+    def ensure_label(self, name: str, color: str = "ededed", description: str = "") -> dict[str, Any]:
+        label = {"node_id": f"L_{name}", "name": name, "color": color, "description": description}
+        self.labels.setdefault(name.lower(), label)
+        return self.labels[name.lower()]
+
+
+def make_handler(state: FakeGitHub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, delayed ACKs add ~40ms per request.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+        def send_json(self, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+            data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def read_json(self) -> dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def rate_limit_headers(self, resource_name: str, limit: int) -> dict[str, str]:
+            return {
+                "X-RateLimit-Resource": resource_name,
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(limit - 1),
+                "X-RateLimit-Reset": str(int(time.time()) + 3600),
+            }
+
+        def rate_limited(self) -> None:
+            detail = {"message": "You have exceeded a secondary rate limit."}
+            self.send_json(state.rate_limit_status, detail, {"Retry-After": "1"})
+
+        def do_GET(self) -> None:
+            url = parse.urlsplit(self.path)
+            query = parse.parse_qs(url.query)
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", ["30"])[0])
+
+            if url.path == "/search/issues":
+                if state.count("GET /search/issues"):
+                    return self.rate_limited()
+                match = re.search(r'"Plan-ID: ([^"]+)"', query.get("q", [""])[0])
+                with state.lock:
+                    numbers = state.plan_ids.get(match.group(1), []) if match else []
+                    items = [state.issues[number] for number in numbers]
+                return self.send_json(200, {"total_count": len(items), "items": items}, self.rate_limit_headers("search", 30))
+
+            if re.fullmatch(r"/repos/[^/]+/[^/]+/issues", url.path):
+                if state.count("GET /repos/{repo}/issues"):
+                    return self.rate_limited()
+                with state.lock:
+                    etag = f'"issues-{state.version}-{page}-{per_page}"'
+                    items = list(state.issues.values())[(page - 1) * per_page : page * per_page]
+                if self.headers.get("If-None-Match") == etag:
+                    return self.send_json(304, None, {"ETag": etag})
+                return self.send_json(200, items, {"ETag": etag, **self.rate_limit_headers("core", 5000)})
+
+            if re.fullmatch(r"/repos/[^/]+/[^/]+/labels", url.path):
+                if state.count("GET /repos/{repo}/labels"):
+                    return self.rate_limited()
+                with state.lock:
+                    items = list(state.labels.values())[(page - 1) * per_page : page * per_page]
+                return self.send_json(200, items, self.rate_limit_headers("core", 5000))
+
+            if LABEL_PATH.fullmatch(url.path):
+                state.count("GET /repos/{repo}/labels/{name}")
+                label = state.labels.get(parse.unquote(url.path.rsplit("/", 1)[1]).lower())
+                return self.send_json(200 if label else 404, label or {"message": "Not Found"})
+
+            state.count(f"GET {url.path}")
+            self.send_json(404, {"message": "Not Found"})
+
+        def do_POST(self) -> None:
+            url = parse.urlsplit(self.path)
+            payload = self.read_json()
+
+            if re.fullmatch(r"/repos/[^/]+/[^/]+/issues", url.path):
+                if state.count("POST /repos/{repo}/issues"):
+                    return self.rate_limited()
+                with state.lock:
+                    issue = state.create_issue(payload["title"], payload["body"], payload.get("labels", []))
+                return self.send_json(201, issue, self.rate_limit_headers("core", 5000))
+
+            if re.fullmatch(r"/repos/[^/]+/[^/]+/labels", url.path):
+                if state.count("POST /repos/{repo}/labels"):
+                    return self.rate_limited()
+                with state.lock:
+                    if payload["name"].lower() in state.labels:
+                        return self.send_json(422, {"message": "Validation Failed"})
+                    label = state.ensure_label(payload["name"], payload.get("color", ""), payload.get("description", ""))
+                return self.send_json(201, label, self.rate_limit_headers("core", 5000))
+
+            if url.path == "/graphql":
+                if state.count("POST /graphql"):
+                    return self.rate_limited()
+                return self.send_json(200, self.graphql(payload), self.rate_limit_headers("graphql", 5000))
+
+            state.count(f"POST {url.path}")
+            self.send_json(404, {"message": "Not Found"})
+
+        def do_PATCH(self) -> None:
+            url = parse.urlsplit(self.path)
+            payload = self.read_json()
+
+            if ISSUE_PATH.fullmatch(url.path):
+                if state.count("PATCH /repos/{repo}/issues/{number}"):
+                    return self.rate_limited()
+                with state.lock:
+                    number = int(url.path.rsplit("/", 1)[1])
+                    if number not in state.issues:
+                        return self.send_json(404, {"message": "Not Found"})
+                    issue = state.update_issue(number, payload)
+                return self.send_json(200, issue, self.rate_limit_headers("core", 5000))
+
+            if LABEL_PATH.fullmatch(url.path):
+                if state.count("PATCH /repos/{repo}/labels/{name}"):
+                    return self.rate_limited()
+                with state.lock:
+                    label = state.labels.get(parse.unquote(url.path.rsplit("/", 1)[1]).lower())
+                    if label is None:
+                        return self.send_json(404, {"message": "Not Found"})
+                    label.update({key: payload[key] for key in ("color", "description") if key in payload})
+                return self.send_json(200, label, self.rate_limit_headers("core", 5000))
+
+            state.count(f"PATCH {url.path}")
+            self.send_json(404, {"message": "Not Found"})
+
+        def graphql(self, payload: dict[str, Any]) -> dict[str, Any]:
+            query = payload.get("query", "")
+            variables = payload.get("variables") or {}
+            with state.lock:
+                if query.lstrip().startswith("mutation"):
+                    data: dict[str, Any] = {}
+                    for alias, kind, name in GRAPHQL_MUTATION.findall(query):
+                        fields = dict(variables[name])
+                        if "labelIds" in fields:
+                            fields["labels"] = [label_id[2:] for label_id in fields.pop("labelIds")]
+                        if fields.get("state") == "OPEN":
+                            fields["state"] = "open"
+                        if kind == "createIssue":
+                            issue = state.create_issue(fields["title"], fields["body"], fields.get("labels", []))
+                        else:
+                            issue = state.update_issue(int(fields.pop("id")[2:]), fields)
+                        data[alias] = {"issue": graphql_issue(issue)}
+                    return {"data": data}
+
+                repository: dict[str, Any] = {"id": "R_bench"}
+                if variables.get("withIssues"):
+                    nodes = [graphql_issue(issue) for issue in state.issues.values()]
+                    repository["issues"] = graphql_page(nodes, variables.get("issuesAfter"))
+                if variables.get("withLabels"):
+                    nodes = [
+                        {"id": label["node_id"], "name": label["name"], "color": label["color"], "description": label["description"]}
+                        for label in state.labels.values()
+                    ]
+                    repository["labels"] = graphql_page(nodes, variables.get("labelsAfter"))
+            reset_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 3600))
+            rate_limit = {"cost": 1, "limit": 5000, "remaining": 4999, "resetAt": reset_at}
+            return {"data": {"rateLimit": rate_limit, "repository": repository}}
+
+    return Handler
+
+
+def graphql_issue(issue: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": issue["node_id"],
+        "number": issue["number"],
+        "title": issue["title"],
+        "body": issue["body"],
+        "state": issue["state"].upper(),
+        "updatedAt": issue["updated_at"],
+        "labels": {"nodes": issue["labels"]},
+    }
+
+
+def graphql_page(nodes: list[dict[str, Any]], after: str | None, size: int = 100) -> dict[str, Any]:
+    start = int(after or 0)
+    return {
+        "pageInfo": {"hasNextPage": start + size < len(nodes), "endCursor": str(start + size)},
+        "nodes": nodes[start : start + size],
+    }
+
+
+def generate_plan(plan_dir: Path, count: int) -> None:
+    """Write `count` specs; every fifth one starts a new dependency chain."""
+    issues_dir = plan_dir / "issues"
+    issues_dir.mkdir(parents=True, exist_ok=True)
+    vision = {"constraints": ["Benchmark constraint one.", "Benchmark constraint two."]}
+    (plan_dir / "vision.yaml").write_text(yaml.safe_dump(vision), encoding="utf-8")
+    for index in range(1, count + 1):
+        spec = {
+            "id": f"BENCH-{index:05d}",
+            "title": f"Benchmark issue {index}",
+            "summary": f"Synthetic spec {index} for relay benchmarks.",
+            "scope": [f"Scope item {item}" for item in range(3)],
+            "non_goals": ["Nothing else"],
+            "acceptance_criteria": [f"Criterion {item}" for item in range(3)],
+            "verify": ["true"],
+            "risk": "high" if index % 10 == 0 else "low",
+            "labels": ["agent-task", f"area:{index % 7}"],
+            "depends_on": [f"BENCH-{index - 1:05d}"] if index % 5 != 1 else [],
+        }
+        path = issues_dir / f"BENCH-{index:05d}.yaml"
+        path.write_text(yaml.safe_dump(spec, allow_unicode=True), encoding="utf-8")
+
+
+def run_relay_child(argv: list[str]) -> int:
+    """Run relay_sync.main in this process and write timing stats for the parent."""
+    stats_path = argv[0]
+    sys.path.insert(0, str(SCRIPT_DIR))
+    import relay_sync
+
+    slept = [0.0]
+    real_sleep = time.sleep
+
+    def counting_sleep(seconds: float) -> None:
+        slept[0] += max(0.0, seconds)
+        real_sleep(seconds)
+
+    time.sleep = counting_sleep
+    sys.argv = ["relay_sync.py", *argv[1:]]
+    started = time.perf_counter()
+    try:
+        code = relay_sync.main()
+    except relay_sync.RelayError as exc:
+        print(f"Relay failed: {exc}", file=sys.stderr)
+        code = 1
+    elapsed = time.perf_counter() - started
+    stats = {
+        "exit_code": code,
+        "relay_seconds": elapsed,
+        "sleep_seconds": slept[0],
+        # ru_maxrss is reported in KiB on Linux.
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "phases": relay_sync._METRICS.phases,
+        "relay_sleeps": relay_sync._METRICS.sleeps,
+    }
+    Path(stats_path).write_text(json.dumps(stats), encoding="utf-8")
+    return code
+
+
+def bench_run(
+    state: FakeGitHub,
+    api_base: str,
+    plan_dir: Path,
+    cache_dir: Path,
+    relay_args: list[str],
+    env: dict[str, str],
+) -> dict[str, Any]:
+    with state.lock:
+        state.requests = {}
+        state.total_requests = 0
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        stats_path = handle.name
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "_run-relay",
+        stats_path,
+        "--plan-dir",
+        str(plan_dir),
+        "--template",
+        str(plan_dir / "missing-template.md"),
+        "--repo",
+        BENCH_REPO,
+        "--token",
+        "bench-token",
+        "--api-base",
+        api_base,
+        "--cache-dir",
+        str(cache_dir),
+        *relay_args,
+    ]
+    started = time.perf_counter()
+    completed = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - started
+    try:
+        stats = json.loads(Path(stats_path).read_text(encoding="utf-8") or "{}")
+    except (OSError, json.JSONDecodeError):
+        stats = {}
+    finally:
+        os.unlink(stats_path)
+    if completed.returncode != 0:
+        stats["stderr"] = completed.stderr[-2000:]
+    with state.lock:
+        requests = dict(sorted(state.requests.items()))
+    return {
+        "exit_code": completed.returncode,
+        "wall_seconds": round(wall, 3),
+        "relay_seconds": round(stats.get("relay_seconds", 0.0), 3),
+        "sleep_seconds": round(stats.get("sleep_seconds", 0.0), 3),
+        "peak_rss_kib": stats.get("peak_rss_kib", 0),
+        "phases": {name: round(seconds, 3) for name, seconds in stats.get("phases", {}).items()},
+        "relay_sleeps": {kind: round(seconds, 3) for kind, seconds in stats.get("relay_sleeps", {}).items()},
+        "requests_total": sum(requests.values()),
+        "requests": requests,
+        **({"stderr": stats["stderr"]} if "stderr" in stats else {}),
+    }
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark relay_sync.py against a local fake GitHub API.")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma-separated spec counts.")
+    parser.add_argument(
+        "--relay-arg",
+        action="append",
+        default=[],
+        help="Extra argument passed to relay_sync.py (repeatable), e.g. --relay-arg=--backend=graphql.",
+    )
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE override for the relay (repeatable).")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with a rate-limit error.")
+    parser.add_argument("--rate-limit-status", type=int, choices=(403, 429), default=429)
+    parser.add_argument("--json", default="", help="Write results as JSON to this path.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    if argv and argv[0] == "_run-relay":
+        return run_relay_child(argv[1:])
+
+    args = parse_args(argv)
+    env = {**os.environ, **BENCH_ENV_DEFAULTS}
+    env.update({key: os.environ[key] for key in BENCH_ENV_DEFAULTS if key in os.environ})
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    for key in ("GITHUB_EVENT_NAME", "GITHUB_EVENT_PATH", "GITHUB_STEP_SUMMARY"):
+        env.pop(key, None)
+
+    results: list[dict[str, Any]] = []
+    for scale in [int(item) for item in args.scales.split(",") if item.strip()]:
+        state = FakeGitHub(args.rate_limit_every, args.rate_limit_status)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        api_base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with tempfile.TemporaryDirectory(prefix="relay-bench-") as workdir:
+                plan_dir = Path(workdir) / "plan"
+                generate_plan(plan_dir, scale)
+                cache_dir = Path(workdir) / "cache"
+                # "initial" creates every issue; "resync" measures the no-change path.
+                for phase in ("initial", "resync"):
+                    result = bench_run(state, api_base, plan_dir, cache_dir, args.relay_arg, env)
+                    result.update({"scale": scale, "phase": phase})
+                    results.append(result)
+                    print(
+                        f"{scale:>6} {phase:<8} exit={result['exit_code']} wall={result['wall_seconds']:.2f}s "
+                        f"sleep={result['sleep_seconds']:.2f}s rss={result['peak_rss_kib'] / 1024:.1f}MiB "
+                        f"requests={result['requests_total']}",
+                        flush=True,
+                    )
+                    for endpoint, count in result["requests"].items():
+                        print(f"{'':>16}{count:>7}  {endpoint}")
+                    if result["exit_code"] != 0:
+                        print(result.get("stderr", ""), file=sys.stderr)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"results": results}, indent=2), encoding="utf-8")
+    return 0 if all(result["exit_code"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -4,15 +4,26 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
+import functools
+import gzip
+import hashlib
+import heapq
+import http.client
 import json
 import os
+import pstats
 import re
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
 from glob import glob
 from pathlib import Path
-from typing import Any
-from urllib import error, parse, request
+from typing import Any, Callable
+from urllib import parse, request
 
 import yaml
 
@@ -52,12 +63,54 @@ LABEL_STYLES = {
     "risk-high": {"color": "b60205", "description": "High risk task"},
 }
 DEFAULT_LABEL_STYLE = {"color": "cfd3d7", "description": "Managed by MuseLucid Relay"}
-ISSUE_SYNC_SLEEP_SECONDS = 10
-API_MIN_INTERVAL_SECONDS_DEFAULT = 1.0
-SEARCH_MIN_INTERVAL_SECONDS_DEFAULT = 2.2
+ISSUE_SYNC_SLEEP_SECONDS_DEFAULT = 0.0
+API_MIN_INTERVAL_SECONDS_DEFAULT = 0.0
+SEARCH_MIN_INTERVAL_SECONDS_DEFAULT = 0.0
+RATE_LIMIT_RESERVE_FRACTION_DEFAULT = 0.2
+CONTENT_CREATION_PER_MINUTE_DEFAULT = 80.0
+WRITE_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
 API_MAX_RETRIES_DEFAULT = 5
 API_BACKOFF_SECONDS_DEFAULT = 2.0
 API_MAX_BACKOFF_SECONDS_DEFAULT = 60.0
+HTTP_TIMEOUT_SECONDS_DEFAULT = 60.0
+HTTP_MAX_IDLE_CONNECTIONS_PER_HOST = 8
+HTTP_MAX_REDIRECTS = 3
+RESPONSE_CACHE_MAX_BYTES_DEFAULT = 32 * 1024 * 1024
+RESPONSE_CACHE_FILENAME = "responses.json"
+SPEC_CACHE_FILENAME = "specs.json"
+SPEC_CACHE_VERSION = 1
+PLAN_PARALLEL_THRESHOLD_DEFAULT = 500
+PROFILE_TOP_FUNCTIONS = 25
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+MANIFEST_JOURNAL_SUFFIX = ".journal"
+RESULTS_VERSION = 1
+TOTALS_PATTERN = re.compile(r"(\w+)=(\d+)")
+SNAPSHOT_VERSION = 1
+CHANGE_PLAN_VERSION = 1
+WRITE_ACTIONS = ("create", "update", "reopen")
+ISSUE_LIST_PAGE_SIZE = 100
+LOOKUP_MODES = ("index", "search")
+BACKENDS = ("rest", "graphql")
+GRAPHQL_BATCH_SIZE_DEFAULT = 20
+GRAPHQL_ISSUE_FIELDS = "id number title body state updatedAt labels(first: 100) { nodes { name } }"
+GRAPHQL_SNAPSHOT_QUERY = """
+query($owner: String!, $name: String!, $issuesAfter: String, $labelsAfter: String,
+      $withIssues: Boolean!, $withLabels: Boolean!) {
+  rateLimit { cost limit remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    id
+    issues(first: 100, after: $issuesAfter) @include(if: $withIssues) {
+      pageInfo { hasNextPage endCursor }
+      nodes { %s }
+    }
+    labels(first: 100, after: $labelsAfter) @include(if: $withLabels) {
+      pageInfo { hasNextPage endCursor }
+      nodes { id name color description }
+    }
+  }
+}
+""" % GRAPHQL_ISSUE_FIELDS
 
 
 def _env_float(name: str, default: float) -> float:
@@ -80,13 +133,23 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+ISSUE_SYNC_SLEEP_SECONDS = _env_float("RELAY_ISSUE_SYNC_SLEEP_SECONDS", ISSUE_SYNC_SLEEP_SECONDS_DEFAULT)
 API_MIN_INTERVAL_SECONDS = _env_float("RELAY_API_MIN_INTERVAL_SECONDS", API_MIN_INTERVAL_SECONDS_DEFAULT)
 SEARCH_MIN_INTERVAL_SECONDS = _env_float("RELAY_SEARCH_MIN_INTERVAL_SECONDS", SEARCH_MIN_INTERVAL_SECONDS_DEFAULT)
 API_MAX_RETRIES = _env_int("RELAY_API_MAX_RETRIES", API_MAX_RETRIES_DEFAULT)
 API_BACKOFF_SECONDS = _env_float("RELAY_API_BACKOFF_SECONDS", API_BACKOFF_SECONDS_DEFAULT)
 API_MAX_BACKOFF_SECONDS = _env_float("RELAY_API_MAX_BACKOFF_SECONDS", API_MAX_BACKOFF_SECONDS_DEFAULT)
-_LAST_REQUEST_AT = {"default": 0.0, "search": 0.0}
+RATE_LIMIT_RESERVE_FRACTION = _env_float("RELAY_RATE_LIMIT_RESERVE_FRACTION", RATE_LIMIT_RESERVE_FRACTION_DEFAULT)
+CONTENT_CREATION_PER_MINUTE = _env_float("RELAY_CONTENT_CREATION_PER_MINUTE", CONTENT_CREATION_PER_MINUTE_DEFAULT)
+HTTP_TIMEOUT_SECONDS = _env_float("RELAY_HTTP_TIMEOUT_SECONDS", HTTP_TIMEOUT_SECONDS_DEFAULT)
+RESPONSE_CACHE_MAX_BYTES = _env_int("RELAY_CACHE_MAX_BYTES", RESPONSE_CACHE_MAX_BYTES_DEFAULT)
+PLAN_PARALLEL_THRESHOLD = _env_int("RELAY_PLAN_PARALLEL_THRESHOLD", PLAN_PARALLEL_THRESHOLD_DEFAULT)
+GRAPHQL_BATCH_SIZE = _env_int("RELAY_GRAPHQL_BATCH_SIZE", GRAPHQL_BATCH_SIZE_DEFAULT)
+_LAST_REQUEST_AT = {"core": 0.0, "search": 0.0, "graphql": 0.0}
 PLAN_ID_PATTERN = re.compile(r"(?im)^Plan-ID:\s*([^\s]+)\s*$")
+TEMPLATE_PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+# libyaml's C loader parses many times faster when PyYAML was built with it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class RelayError(Exception):
@@ -104,6 +167,437 @@ class GitHubApiError(RelayError):
         super().__init__(f"GitHub API error {status} {method} {path}: {detail}")
 
 
+@dataclass
+class RateBudget:
+    """Primary rate-limit budget reported by the X-RateLimit-* response headers."""
+
+    limit: int = 0
+    remaining: int = -1
+    reset_at: float = 0.0
+
+    def delay_seconds(self, now: float) -> float:
+        if self.remaining < 0 or self.limit <= 0:
+            return 0.0
+        window = max(0.0, self.reset_at - now)
+        if window <= 0:
+            return 0.0
+        if self.remaining == 0:
+            return window + 1.0
+        reserve = self.limit * RATE_LIMIT_RESERVE_FRACTION
+        if self.remaining > reserve:
+            return 0.0
+        # Spread what is left of the budget evenly over the rest of the window.
+        return window / self.remaining
+
+    def consume(self) -> None:
+        if self.remaining > 0:
+            self.remaining -= 1
+
+
+@dataclass
+class TokenBucket:
+    """Local token bucket for limits GitHub does not report in headers."""
+
+    per_minute: float
+    tokens: float = -1.0
+    updated_at: float = 0.0
+
+    def delay_seconds(self, now: float, count: int = 1) -> float:
+        if self.per_minute <= 0:
+            return 0.0
+        rate = self.per_minute / 60.0
+        if self.tokens < 0:
+            self.tokens = self.per_minute
+        else:
+            self.tokens = min(self.per_minute, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+        # A batch larger than the bucket waits for a full bucket rather than forever.
+        needed = min(float(count), self.per_minute)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / rate
+
+    def consume(self, count: int = 1) -> None:
+        self.tokens -= count
+
+
+_RATE_BUDGETS: dict[str, RateBudget] = {"core": RateBudget(), "search": RateBudget(), "graphql": RateBudget()}
+_CONTENT_CREATION_BUCKET = TokenBucket(per_minute=CONTENT_CREATION_PER_MINUTE)
+# Shared by all sync workers: throttle state, rate budgets and the Plan-ID index.
+_THROTTLE_LOCK = threading.Lock()
+_INDEX_LOCK = threading.Lock()
+_LABELS_LOCK = threading.Lock()
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections reused across requests, pooled per host."""
+
+    # Raised when the server already closed an idle keep-alive connection.
+    STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+    # Safe to resend after the request was fully written; anything else may already have been applied.
+    IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT_SECONDS) -> None:
+        self.timeout = timeout
+        self.idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self.lock = threading.Lock()
+
+    def request(self, method: str, url: str, body: bytes | None, headers: dict[str, str]) -> HttpResponse:
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            response = self._request_once(method, url, body, headers)
+            location = response.headers.get("Location")
+            # Like urllib, only follow redirects for reads.
+            if response.status not in {301, 302, 307, 308} or method != "GET" or not location:
+                return response
+            url = parse.urljoin(url, location)
+        return response
+
+    def _request_once(self, method: str, url: str, body: bytes | None, headers: dict[str, str]) -> HttpResponse:
+        parts = parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        headers = {**headers, "Accept-Encoding": "gzip", "Host": parts.netloc}
+
+        fresh = False
+        while True:
+            conn, reused = self._acquire(key, fresh)
+            sent = False
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except self.STALE_ERRORS as exc:
+                conn.close()
+                if not reused:
+                    raise
+                if sent and method not in self.IDEMPOTENT_METHODS:
+                    # The server may have processed the write before dropping the connection;
+                    # resending could create a duplicate issue, so fail instead.
+                    raise RelayError(
+                        f"Connection lost after sending {method} {parts.path}; not retried because "
+                        f"the server may have applied it ({exc.__class__.__name__})"
+                    ) from exc
+                # Reconnect transparently once: a failed send never reached the server,
+                # and reads are safe to repeat.
+                fresh = True
+            except BaseException:
+                conn.close()
+                raise
+
+        if response.getheader("Content-Encoding", "").lower() == "gzip":
+            data = gzip.decompress(data)
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        return HttpResponse(response.status, response.headers, data)
+
+    def _acquire(self, key: tuple[str, str, int], fresh: bool = False) -> tuple[http.client.HTTPConnection, bool]:
+        if not fresh:
+            with self.lock:
+                idle = self.idle.get(key)
+                if idle:
+                    return idle.pop(), True
+        scheme, host, port = key
+        if scheme != "https":
+            return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+        proxy = request.getproxies().get("https")
+        if proxy and not request.proxy_bypass(host):
+            proxy_parts = parse.urlsplit(proxy)
+            conn = http.client.HTTPSConnection(proxy_parts.hostname or "", proxy_parts.port or 443, timeout=self.timeout)
+            conn.set_tunnel(host, port)
+            return conn, False
+        return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < HTTP_MAX_IDLE_CONNECTIONS_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self.lock:
+            connections = [conn for idle in self.idle.values() for conn in idle]
+            self.idle.clear()
+        for conn in connections:
+            conn.close()
+
+
+_HTTP_POOL = ConnectionPool()
+
+
+class ResponseCache:
+    """On-disk cache of GET responses revalidated with ETag / Last-Modified."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = RESPONSE_CACHE_MAX_BYTES) -> None:
+        self.path = cache_dir / RESPONSE_CACHE_FILENAME
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.total_bytes = 0
+        self.dirty = False
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def load(self) -> None:
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                stored = json.load(handle) or {}
+        except (OSError, json.JSONDecodeError):
+            return
+        # Entries are persisted least recently used first.
+        for key, entry in stored.get("entries", []):
+            if isinstance(entry, dict) and "data" in entry:
+                self._put(key, entry)
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump({"entries": list(self.entries.items())}, handle)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+    def get(self, method: str, url: str) -> dict[str, Any] | None:
+        key = self.key(method, url)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        return entry
+
+    def conditional_headers(self, entry: dict[str, Any] | None) -> dict[str, str]:
+        if entry is None:
+            return {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, method: str, url: str, etag: str | None, last_modified: str | None, raw: str, data: Any) -> None:
+        if not etag and not last_modified:
+            return
+        entry = {"etag": etag or "", "last_modified": last_modified or "", "size": len(raw), "data": data}
+        with self.lock:
+            self._put(self.key(method, url), entry)
+            self.dirty = True
+
+    def invalidate(self, prefixes: list[str]) -> None:
+        with self.lock:
+            stale = [key for key in self.entries if any(key.split(" ", 1)[1].startswith(prefix) for prefix in prefixes)]
+            for key in stale:
+                self.total_bytes -= int(self.entries.pop(key).get("size", 0))
+            if stale:
+                self.dirty = True
+
+    def _put(self, key: str, entry: dict[str, Any]) -> None:
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= int(previous.get("size", 0))
+        self.entries[key] = entry
+        self.total_bytes += int(entry.get("size", 0))
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= int(evicted.get("size", 0))
+
+
+_RESPONSE_CACHE: ResponseCache | None = None
+
+
+def configure_response_cache(cache_dir: str) -> ResponseCache | None:
+    global _RESPONSE_CACHE
+    if not cache_dir:
+        _RESPONSE_CACHE = None
+        return None
+    _RESPONSE_CACHE = ResponseCache(Path(cache_dir))
+    _RESPONSE_CACHE.load()
+    return _RESPONSE_CACHE
+
+
+def save_response_cache() -> None:
+    if _RESPONSE_CACHE is not None:
+        _RESPONSE_CACHE.save()
+
+
+class RunMetrics:
+    """Per-request and per-phase timings for one relay run."""
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.requests: list[dict[str, Any]] = []
+        self.phases: dict[str, float] = {}
+        self.sleeps: dict[str, float] = {}
+        # Top-level phase currently running; phases entered inside it (on any
+        # thread, since render runs in the write pool) become "parent/name".
+        self.active: str | None = None
+        self.lock = threading.Lock()
+
+    def record_request(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        latency: float,
+        retries: int,
+        throttle_wait: float,
+    ) -> None:
+        entry = {
+            "method": method.upper(),
+            "path": path,
+            "bucket": _request_bucket(path),
+            "status": status,
+            "latency_seconds": round(latency, 6),
+            "retries": retries,
+            "throttle_wait_seconds": round(throttle_wait, 6),
+        }
+        with self.lock:
+            self.requests.append(entry)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_sleep(self, kind: str, seconds: float) -> None:
+        with self.lock:
+            self.sleeps[kind] = self.sleeps.get(kind, 0.0) + seconds
+
+    def phase(self, name: str) -> "_PhaseTimer":
+        return _PhaseTimer(self, name)
+
+    def top_level_seconds(self) -> float:
+        """Sum of top-level phases; sub-phases are already inside their parent."""
+        with self.lock:
+            return sum(seconds for name, seconds in self.phases.items() if "/" not in name)
+
+    def bucket_totals(self) -> dict[str, dict[str, Any]]:
+        totals: dict[str, dict[str, Any]] = {}
+        with self.lock:
+            requests = list(self.requests)
+        for entry in requests:
+            bucket = totals.setdefault(
+                entry["bucket"],
+                {"requests": 0, "errors": 0, "retries": 0, "latency_seconds": 0.0, "throttle_wait_seconds": 0.0, "latencies": []},
+            )
+            bucket["requests"] += 1
+            bucket["errors"] += 1 if not (200 <= entry["status"] < 300 or entry["status"] == 304) else 0
+            bucket["retries"] += entry["retries"]
+            bucket["latency_seconds"] += entry["latency_seconds"]
+            bucket["throttle_wait_seconds"] += entry["throttle_wait_seconds"]
+            bucket["latencies"].append(entry["latency_seconds"])
+        for bucket in totals.values():
+            latencies = sorted(bucket.pop("latencies"))
+            bucket["p50_seconds"] = latencies[len(latencies) // 2]
+            bucket["p95_seconds"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return totals
+
+    def to_dict(self) -> dict[str, Any]:
+        with self.lock:
+            requests = list(self.requests)
+            phases = dict(self.phases)
+            sleeps = dict(self.sleeps)
+        return {
+            "total_seconds": time.perf_counter() - self.started_at,
+            "phases": phases,
+            "sleeps": sleeps,
+            "buckets": self.bucket_totals(),
+            "requests": requests,
+        }
+
+    def save(self, path: str) -> None:
+        metrics_path = Path(path)
+        metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        with metrics_path.open("w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2)
+
+    def summary_markdown(self) -> list[str]:
+        buckets = self.bucket_totals()
+        with self.lock:
+            phases = dict(self.phases)
+            sleeps = dict(self.sleeps)
+        if not buckets and not phases:
+            return []
+        lines = [
+            "### Relay Metrics",
+            "",
+            f"Total: {time.perf_counter() - self.started_at:.2f}s",
+            "",
+            "| Bucket | Requests | Errors | Retries | Latency (s) | p50 (ms) | p95 (ms) | Throttle wait (s) |",
+            "| --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |",
+        ]
+        for name, bucket in sorted(buckets.items()):
+            lines.append(
+                f"| {name} | {bucket['requests']} | {bucket['errors']} | {bucket['retries']} "
+                f"| {bucket['latency_seconds']:.2f} | {bucket['p50_seconds'] * 1000:.0f} "
+                f"| {bucket['p95_seconds'] * 1000:.0f} | {bucket['throttle_wait_seconds']:.2f} |"
+            )
+        lines += ["", "| Phase | Seconds |", "| --- | ---: |"]
+        for name, seconds in phases.items():
+            # Sub-phases follow their parent; ones run on worker threads add up across threads.
+            if "/" in name:
+                continue
+            lines.append(f"| {name} | {seconds:.2f} |")
+            lines += [
+                f"| {sub} | {sub_seconds:.2f} |"
+                for sub, sub_seconds in phases.items()
+                if sub.startswith(f"{name}/")
+            ]
+        lines.append(f"| **phases total** | {self.top_level_seconds():.2f} |")
+        lines += [f"| sleep: {kind} | {seconds:.2f} |" for kind, seconds in sorted(sleeps.items())]
+        return lines
+
+
+class _PhaseTimer:
+    def __init__(self, metrics: RunMetrics, name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.key = name
+        self.outermost = False
+        self.started_at = 0.0
+
+    def __enter__(self) -> None:
+        with self.metrics.lock:
+            parent = self.metrics.active
+            if parent is None:
+                self.metrics.active = self.name
+                self.outermost = True
+            elif parent != self.name:
+                self.key = f"{parent}/{self.name}"
+        self.started_at = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self.started_at
+        if self.outermost:
+            with self.metrics.lock:
+                self.metrics.active = None
+        elif self.key == self.name:
+            # Re-entering the running phase is already counted by the outer timer.
+            return
+        self.metrics.add_phase(self.key, elapsed)
+
+
+_METRICS = RunMetrics()
+
+
 @dataclass
 class IssueSpec:
     issue_id: str
@@ -118,15 +612,362 @@ class IssueSpec:
     depends_on: list[str]
 
 
+@dataclass
+class SyncOutcome:
+    status: str
+    message: str
+    number: int | None = None
+    digest: str = ""
+
+
+@dataclass
+class IssueChange:
+    """Write needed to bring one GitHub issue in line with its spec."""
+
+    plan_id: str
+    action: str
+    title: str
+    body: str
+    labels: list[str]
+    new_labels: list[str]
+    unresolved: list[str]
+    digest: str
+    number: int | None = None
+    node_id: str = ""
+    reopen: bool = False
+
+
+@dataclass
+class DependencyGraph:
+    """depends_on edges between plan specs, with specs in topological order."""
+
+    order: list[str]
+    depends_on: dict[str, list[str]]
+    dependents: dict[str, list[str]]
+    dangling: dict[str, list[str]]
+
+    def referenced_ids(self) -> list[str]:
+        """Plan-IDs of every spec plus dependencies that live outside the plan."""
+        return dedupe(self.order + [dep for deps in self.dangling.values() for dep in deps])
+
+    def transitive_dependents(self, plan_id: str) -> list[str]:
+        """Specs that depend on `plan_id` directly or through other specs, in topological order."""
+        pending = list(self.dependents.get(plan_id, []))
+        # Plan-IDs outside the plan have no dependents entry; their direct dependents are in dangling.
+        pending += [spec_id for spec_id, deps in self.dangling.items() if plan_id in deps]
+        found: set[str] = set()
+        while pending:
+            current = pending.pop()
+            if current in found:
+                continue
+            found.add(current)
+            pending.extend(self.dependents.get(current, []))
+        return [spec_id for spec_id in self.order if spec_id in found]
+
+    def upstream_ids(self, plan_ids: list[str]) -> list[str]:
+        """`plan_ids` plus every Plan-ID they depend on, directly or transitively."""
+        pending = list(plan_ids)
+        found: list[str] = []
+        seen: set[str] = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            found.append(current)
+            pending.extend(self.depends_on.get(current, []))
+        return found
+
+
+class SyncManifest:
+    """Per-spec content hashes recorded by the last successful sync.
+
+    Every record is also appended to a journal next to the manifest, so a run
+    cancelled part-way resumes from the specs it already finished.
+    """
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = path
+        self.journal_path = path.with_suffix(MANIFEST_JOURNAL_SUFFIX)
+        self.fingerprint = fingerprint
+        self.previous: dict[str, dict[str, Any]] = {}
+        self.journaled: dict[str, dict[str, Any]] = {}
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.journal: Any = None
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                stored = json.load(handle) or {}
+        except (OSError, json.JSONDecodeError):
+            stored = {}
+        # A different template, constraint set or repo invalidates every entry.
+        if stored.get("version") == MANIFEST_VERSION and stored.get("fingerprint") == self.fingerprint:
+            entries = stored.get("entries")
+            if isinstance(entries, dict):
+                self.previous = entries
+        self.journaled = self._replay_journal()
+        self.previous.update(self.journaled)
+
+    def _replay_journal(self) -> dict[str, dict[str, Any]]:
+        try:
+            with self.journal_path.open("r", encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+        except OSError:
+            return {}
+        if not lines:
+            return {}
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            return {}
+        if header.get("version") != MANIFEST_VERSION or header.get("fingerprint") != self.fingerprint:
+            return {}
+        replayed: dict[str, dict[str, Any]] = {}
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # The run was killed mid-write; everything before this line is intact.
+                break
+            replayed[str(record["plan_id"])] = {"hash": record["hash"], "number": record["number"]}
+        # Matching journal: keep appending to it instead of starting over.
+        self.journal = self.journal_path.open("a", encoding="utf-8")
+        return replayed
+
+    def is_current(
+        self,
+        plan_id: str,
+        digest: str,
+        index: dict[str, dict[str, Any]] | None,
+        title: str = "",
+        body: str = "",
+        labels: list[str] | None = None,
+    ) -> int | None:
+        entry = self.previous.get(plan_id)
+        if not entry or entry.get("hash") != digest:
+            return None
+        number = entry.get("number")
+        if index is not None:
+            # The index is free to consult, so also catch deleted, recreated, closed or hand-edited issues.
+            live = index.get(plan_id)
+            if not live or live.get("number") != number or str(live.get("state", "")).lower() != "open":
+                return None
+            if labels is not None:
+                live_labels = [str(label.get("name", "")).strip() for label in live.get("labels", [])]
+                final_labels = calc_final_labels([label for label in live_labels if label], labels)
+                if not issue_matches(live, title, body, final_labels):
+                    return None
+        return int(number)
+
+    def completed(self, plan_id: str, digest: str) -> int | None:
+        """Issue number when an interrupted earlier run already wrote this exact content."""
+        entry = self.journaled.get(plan_id)
+        if not entry or entry.get("hash") != digest:
+            return None
+        return int(entry["number"])
+
+    def record(self, plan_id: str, digest: str, number: int) -> None:
+        entry = {"hash": digest, "number": number}
+        with self.lock:
+            if self.entries.get(plan_id) == entry:
+                return
+            self.entries[plan_id] = entry
+            if self.previous.get(plan_id) == entry:
+                # Already in the manifest or journal this run started from.
+                return
+            if self.journal is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.journal = self.journal_path.open("w", encoding="utf-8")
+                self.journal.write(json.dumps({"version": MANIFEST_VERSION, "fingerprint": self.fingerprint}) + "\n")
+            self.journal.write(json.dumps({"plan_id": plan_id, **entry}) + "\n")
+            # Flushed per record so a cancelled run loses at most the spec in flight.
+            self.journal.flush()
+
+    def carry_over(self, plan_ids: list[str]) -> None:
+        """Keep the previous entries of specs this run did not visit."""
+        with self.lock:
+            for plan_id in plan_ids:
+                if plan_id in self.previous and plan_id not in self.entries:
+                    self.entries[plan_id] = self.previous[plan_id]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(
+                {"version": MANIFEST_VERSION, "fingerprint": self.fingerprint, "entries": self.entries},
+                handle,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+        # The manifest now holds everything the journal did.
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            self.journal_path.unlink(missing_ok=True)
+
+
+@dataclass
+class IssueSnapshot:
+    """Issue and label state of a repository, as seen by one fetch."""
+
+    repo: str
+    repository_id: str
+    issues: dict[str, dict[str, Any]]
+    labels: dict[str, dict[str, Any]] | None = None
+
+    def save(self, path: Path) -> None:
+        write_json_file(path, {"version": SNAPSHOT_VERSION, **asdict(self)})
+
+    @staticmethod
+    def load(path: Path) -> "IssueSnapshot":
+        stored = read_json_file(path, SNAPSHOT_VERSION, "snapshot")
+        labels = stored.get("labels")
+        return IssueSnapshot(
+            repo=str(stored.get("repo", "")),
+            repository_id=str(stored.get("repository_id", "")),
+            issues=dict(stored.get("issues") or {}),
+            labels=dict(labels) if isinstance(labels, dict) else None,
+        )
+
+
+def write_json_file(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def shard_spec(value: str) -> tuple[int, int] | None:
+    if not value:
+        return None
+    index_text, _, count_text = value.partition("/")
+    try:
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got {value!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in [0, COUNT), got {value!r}")
+    return index, count
+
+
+def shard_of(plan_id: str, count: int) -> int:
+    # A stable hash, unlike hash(), so every shard process agrees on ownership.
+    return int(hashlib.sha256(plan_id.encode("utf-8")).hexdigest()[:8], 16) % count
+
+
+def manifest_path(cache_dir: str, shard: tuple[int, int] | None) -> Path:
+    if not shard:
+        return Path(cache_dir) / MANIFEST_FILENAME
+    name = Path(MANIFEST_FILENAME)
+    return Path(cache_dir) / f"{name.stem}-shard{shard[0]}of{shard[1]}{name.suffix}"
+
+
+def read_json_file(path: Path, version: int, kind: str) -> dict[str, Any]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            stored = json.load(handle)
+    except (OSError, json.JSONDecodeError) as exc:
+        raise RelayError(f"Failed to read {kind} {path}: {exc}") from exc
+    if not isinstance(stored, dict) or stored.get("version") != version:
+        raise RelayError(f"Unsupported {kind} format in {path}")
+    return stored
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sync .muselucid plan issues to GitHub Issues.")
     parser.add_argument("--plan-dir", default=".muselucid/plan")
     parser.add_argument("--template", default=".muselucid/templates/issue.md")
     parser.add_argument("--repo", default=os.getenv("GITHUB_REPOSITORY", ""))
-    parser.add_argument("--token", default=os.getenv("GITHUB_TOKEN", ""))
+    # Resolved after parsing: an explicit --token wins over the shard and GITHUB_TOKEN defaults.
+    parser.add_argument("--token", default=None)
     parser.add_argument("--api-base", default=os.getenv("GITHUB_API_URL", "https://api.github.com"))
-    parser.add_argument("--dry-run", action="store_true")
-    return parser.parse_args()
+    parser.add_argument(
+        "--lookup",
+        choices=LOOKUP_MODES,
+        default=os.getenv("RELAY_LOOKUP_MODE", "index"),
+        help="Resolve Plan-IDs from a paged issue index (default) or one Search API call per lookup.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv("RELAY_CACHE_DIR", ""),
+        help="Directory for the conditional-request response cache (disabled when empty).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=_env_int("RELAY_CONCURRENCY", 1),
+        help="Number of specs synced in parallel; all workers share the API throttle.",
+    )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Ignore the manifest in --cache-dir and process every spec.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=os.getenv("RELAY_BACKEND", "rest"),
+        help="Sync through per-issue REST calls (default) or batched GraphQL queries and mutations.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=os.getenv("RELAY_METRICS_FILE", ""),
+        help="Write per-request and per-phase timings as JSON to this path.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="relay.prof",
+        default="",
+        help="Run under cProfile, dump stats to this path (default relay.prof) and print the hottest functions.",
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=os.getenv("RELAY_SNAPSHOT", ""),
+        help="Read issue and label state from this JSON snapshot instead of the API.",
+    )
+    parser.add_argument("--write-snapshot", default="", help="Save the fetched issue and label state to this path.")
+    parser.add_argument(
+        "--shard",
+        type=shard_spec,
+        default=os.getenv("RELAY_SHARD", ""),
+        help="Sync only the specs whose Plan-ID hashes to INDEX of COUNT shards, e.g. 0/4. "
+        "RELAY_SHARD_<INDEX>_TOKEN, when set, is that shard's default token.",
+    )
+    parser.add_argument(
+        "--results-file",
+        default=os.getenv("RELAY_RESULTS_FILE", ""),
+        help="Write the result lines to this JSON file instead of GITHUB_STEP_SUMMARY (see --merge-results).",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--dry-run", action="store_true")
+    mode.add_argument(
+        "--plan-out",
+        default="",
+        help="Write the creates, updates, reopens and label changes to this path instead of applying them.",
+    )
+    mode.add_argument(
+        "--apply",
+        default="",
+        help="Execute a change plan written by --plan-out; specs and issue state are not re-read.",
+    )
+    mode.add_argument(
+        "--merge-results",
+        nargs="+",
+        default=[],
+        metavar="FILE",
+        help="Combine --results-file outputs of sharded runs into one GITHUB_STEP_SUMMARY.",
+    )
+    args = parser.parse_args()
+    if args.token is None:
+        shard_token = os.getenv(f"RELAY_SHARD_{args.shard[0]}_TOKEN", "") if args.shard else ""
+        args.token = shard_token or os.getenv("GITHUB_TOKEN", "")
+    return args
 
 
 def api_request(
@@ -135,47 +976,86 @@ def api_request(
     path: str,
     token: str,
     payload: dict[str, Any] | None = None,
+    writes: int | None = None,
 ) -> Any:
     url = f"{api_base.rstrip('/')}{path}"
     body = None
     if payload is not None:
         body = json.dumps(payload).encode("utf-8")
 
-    for attempt in range(API_MAX_RETRIES + 1):
-        _throttle_request(path)
-
-        req = request.Request(url, data=body, method=method.upper())
-        req.add_header("Accept", "application/vnd.github+json")
-        req.add_header("Authorization", f"Bearer {token}")
-        req.add_header("X-GitHub-Api-Version", "2022-11-28")
-        if payload is not None:
-            req.add_header("Content-Type", "application/json")
+    cache = _RESPONSE_CACHE if method.upper() == "GET" else None
+    cached = cache.get(method, url) if cache is not None else None
 
-        try:
-            with request.urlopen(req) as response:
-                raw = response.read().decode("utf-8")
-                if not raw:
-                    return {}
-                return json.loads(raw)
-        except error.HTTPError as exc:
-            detail = exc.read().decode("utf-8", errors="ignore")
-            if attempt < API_MAX_RETRIES and _is_rate_limited_error(exc.code, detail):
-                delay = _retry_delay_seconds(exc, attempt)
+    status = 0
+    latency = 0.0
+    throttle_wait = 0.0
+    attempt = 0
+    try:
+        for attempt in range(API_MAX_RETRIES + 1):
+            throttle_wait += _throttle_request(method, path, writes)
+
+            headers = {
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {token}",
+                "X-GitHub-Api-Version": "2022-11-28",
+            }
+            if payload is not None:
+                headers["Content-Type"] = "application/json"
+            if cache is not None:
+                headers.update(cache.conditional_headers(cached))
+
+            sent_at = time.perf_counter()
+            response = _HTTP_POOL.request(method.upper(), url, body, headers)
+            latency += time.perf_counter() - sent_at
+            status = response.status
+            _record_rate_limit(path, response.headers)
+            if 200 <= response.status < 300:
+                raw = response.body.decode("utf-8")
+                data = json.loads(raw) if raw else {}
+                if cache is not None:
+                    cache.store(method, url, response.headers.get("ETag"), response.headers.get("Last-Modified"), raw, data)
+                elif _RESPONSE_CACHE is not None:
+                    _RESPONSE_CACHE.invalidate(_cache_invalidation_prefixes(api_base, path))
+                return data
+
+            if response.status == 304 and cached is not None:
+                # Not modified: GitHub does not charge conditional hits against the rate limit.
+                return cached["data"]
+            detail = response.body.decode("utf-8", errors="ignore")
+            if attempt < API_MAX_RETRIES and _is_rate_limited_error(response.status, detail):
+                delay = _retry_delay_seconds(response.headers, attempt)
                 print(
-                    f"Rate limited ({exc.code}) on {method.upper()} {path}. "
+                    f"Rate limited ({response.status}) on {method.upper()} {path}. "
                     f"Sleeping {delay:.1f}s before retry {attempt + 1}/{API_MAX_RETRIES}."
                 )
+                _METRICS.add_sleep("retry", delay)
                 time.sleep(delay)
                 continue
-            raise GitHubApiError(exc.code, method, path, detail) from exc
+            raise GitHubApiError(response.status, method, path, detail)
+    finally:
+        _METRICS.record_request(method, path, status, latency, attempt, throttle_wait)
 
     raise RelayError(f"API request retries exhausted: {method.upper()} {path}")
 
 
+def _cache_invalidation_prefixes(api_base: str, path: str) -> list[str]:
+    base = api_base.rstrip("/")
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    if len(parts) < 4 or parts[0] != "repos":
+        return [f"{base}{path.split('?', 1)[0]}"]
+    collection = f"{base}/repos/{parts[1]}/{parts[2]}/{parts[3]}"
+    prefixes = [collection]
+    if parts[3] == "issues":
+        prefixes.append(f"{base}/search/issues")
+    return prefixes
+
+
 def _request_bucket(path: str) -> str:
     if path.startswith("/search/"):
         return "search"
-    return "default"
+    if path == "/graphql":
+        return "graphql"
+    return "core"
 
 
 def _bucket_min_interval_seconds(bucket: str) -> float:
@@ -184,16 +1064,52 @@ def _bucket_min_interval_seconds(bucket: str) -> float:
     return API_MIN_INTERVAL_SECONDS
 
 
-def _throttle_request(path: str) -> None:
+def _throttle_request(method: str, path: str, writes: int | None = None) -> float:
+    """Wait for a request slot and return the seconds spent waiting."""
     bucket = _request_bucket(path)
+    if writes is None:
+        writes = 1 if method.upper() in WRITE_METHODS else 0
     min_interval = _bucket_min_interval_seconds(bucket)
-    if min_interval <= 0:
+    waited = 0.0
+    while True:
+        with _THROTTLE_LOCK:
+            now = time.monotonic()
+            delay = _RATE_BUDGETS[bucket].delay_seconds(time.time())
+            if writes:
+                delay = max(delay, _CONTENT_CREATION_BUCKET.delay_seconds(now, writes))
+            if min_interval > 0:
+                delay = max(delay, min_interval - (now - _LAST_REQUEST_AT[bucket]))
+            if delay <= 0:
+                # Claim the slot while holding the lock so workers never share it.
+                _RATE_BUDGETS[bucket].consume()
+                if writes:
+                    _CONTENT_CREATION_BUCKET.consume(writes)
+                _LAST_REQUEST_AT[bucket] = now
+                if waited:
+                    _METRICS.add_sleep("throttle", waited)
+                return waited
+        time.sleep(delay)
+        waited += delay
+
+
+def _record_rate_limit(path: str, headers: Any) -> None:
+    if headers is None:
         return
-
-    elapsed = time.monotonic() - _LAST_REQUEST_AT[bucket]
-    if elapsed < min_interval:
-        time.sleep(min_interval - elapsed)
-    _LAST_REQUEST_AT[bucket] = time.monotonic()
+    remaining = headers.get("X-RateLimit-Remaining")
+    if remaining is None:
+        return
+    resource = str(headers.get("X-RateLimit-Resource") or _request_bucket(path))
+    try:
+        remaining_count = int(remaining)
+        limit = int(headers.get("X-RateLimit-Limit") or 0)
+        reset_at = float(headers.get("X-RateLimit-Reset") or 0)
+    except ValueError:
+        return
+    with _THROTTLE_LOCK:
+        budget = _RATE_BUDGETS.setdefault(resource, RateBudget())
+        budget.remaining = remaining_count
+        budget.limit = limit or budget.limit
+        budget.reset_at = reset_at
 
 
 def _is_rate_limited_error(status: int, detail: str) -> bool:
@@ -205,15 +1121,15 @@ def _is_rate_limited_error(status: int, detail: str) -> bool:
     return "rate limit" in lowered or "secondary rate limit" in lowered or "abuse detection" in lowered
 
 
-def _retry_delay_seconds(exc: error.HTTPError, attempt: int) -> float:
-    retry_after = exc.headers.get("Retry-After")
+def _retry_delay_seconds(headers: Any, attempt: int) -> float:
+    retry_after = headers.get("Retry-After")
     if retry_after:
         try:
             return max(1.0, float(retry_after))
         except ValueError:
             pass
 
-    reset_at = exc.headers.get("X-RateLimit-Reset")
+    reset_at = headers.get("X-RateLimit-Reset")
     if reset_at:
         try:
             wait_seconds = int(reset_at) - int(time.time()) + 1
@@ -229,10 +1145,16 @@ def _retry_delay_seconds(exc: error.HTTPError, attempt: int) -> float:
 def load_yaml(path: Path) -> dict[str, Any]:
     if not path.exists():
         raise RelayError(f"Missing required file: {path}")
-    with path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+    return parse_yaml(path.read_text(encoding="utf-8"), path)
+
+
+def parse_yaml(text: str, source: Path) -> dict[str, Any]:
+    try:
+        data = yaml.load(text, Loader=YAML_LOADER) or {}
+    except yaml.YAMLError as exc:
+        raise RelayError(f"Invalid YAML in {source}: {exc}") from exc
     if not isinstance(data, dict):
-        raise RelayError(f"YAML must be a map object: {path}")
+        raise RelayError(f"YAML must be a map object: {source}")
     return data
 
 
@@ -283,33 +1205,100 @@ def bullets(items: list[str], empty: str = "(none)") -> str:
     return "\n".join(f"- {item}" for item in items)
 
 
-def load_issue_specs(plan_dir: Path) -> list[IssueSpec]:
-    issue_specs: list[IssueSpec] = []
-    issue_paths = sorted(glob(str(plan_dir / "issues" / "*.yaml")))
-    for raw_path in issue_paths:
-        path = Path(raw_path)
-        data = load_yaml(path)
-        risk = require_string(data, "risk", path).lower()
+def parse_issue_spec(text: str, path: Path) -> tuple[IssueSpec | None, list[str]]:
+    """Validate one plan issue file, collecting every problem instead of stopping at the first."""
+    try:
+        data = parse_yaml(text, path)
+    except RelayError as exc:
+        return None, [str(exc)]
+
+    errors: list[str] = []
+
+    def check(getter: Any, key: str) -> Any:
+        try:
+            return getter(data, key, path)
+        except RelayError as exc:
+            errors.append(str(exc))
+            return None
+
+    risk = check(require_string, "risk")
+    if risk is not None:
+        risk = risk.lower()
         if risk not in {"low", "medium", "high"}:
-            raise RelayError(f"'risk' must be one of low|medium|high in {path}")
-
-        labels = require_list(data, "labels", path)
-
-        issue_specs.append(
-            IssueSpec(
-                issue_id=require_string(data, "id", path),
-                title=require_string(data, "title", path),
-                summary=require_string(data, "summary", path),
-                scope=require_list(data, "scope", path),
-                non_goals=require_list(data, "non_goals", path),
-                acceptance_criteria=require_list(data, "acceptance_criteria", path),
-                verify=require_list(data, "verify", path),
-                risk=risk,
-                labels=dedupe(labels),
-                depends_on=optional_list(data, "depends_on", path),
-            )
-        )
-    return issue_specs
+            errors.append(f"'risk' must be one of low|medium|high in {path}")
+
+    fields = {
+        "issue_id": check(require_string, "id"),
+        "title": check(require_string, "title"),
+        "summary": check(require_string, "summary"),
+        "scope": check(require_list, "scope"),
+        "non_goals": check(require_list, "non_goals"),
+        "acceptance_criteria": check(require_list, "acceptance_criteria"),
+        "verify": check(require_list, "verify"),
+        "labels": check(require_list, "labels"),
+        "depends_on": check(optional_list, "depends_on"),
+    }
+    if errors:
+        return None, errors
+    fields["labels"] = dedupe(fields["labels"])
+    return IssueSpec(risk=risk, **fields), []
+
+
+def _parse_issue_spec_worker(job: tuple[str, str]) -> tuple[dict[str, Any] | None, list[str]]:
+    # Runs in a worker process; plain dicts pickle cheaply.
+    raw_path, text = job
+    spec, errors = parse_issue_spec(text, Path(raw_path))
+    return (asdict(spec) if spec else None), errors
+
+
+def load_issue_specs(plan_dir: Path, cache_dir: str = "") -> list[IssueSpec]:
+    issue_paths = sorted(glob(str(plan_dir / "issues" / "*.yaml")))
+    texts = [Path(raw_path).read_text(encoding="utf-8") for raw_path in issue_paths]
+    digests = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+
+    cache_path = Path(cache_dir) / SPEC_CACHE_FILENAME if cache_dir else None
+    cached = _load_spec_cache(cache_path)
+
+    misses = [position for position, digest in enumerate(digests) if digest not in cached]
+    jobs = [(issue_paths[position], texts[position]) for position in misses]
+    if len(jobs) >= PLAN_PARALLEL_THRESHOLD > 0 and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor() as pool:
+            parsed = list(pool.map(_parse_issue_spec_worker, jobs, chunksize=64))
+    else:
+        parsed = [_parse_issue_spec_worker(job) for job in jobs]
+
+    errors: list[str] = []
+    for position, (spec_data, spec_errors) in zip(misses, parsed):
+        errors.extend(spec_errors)
+        if spec_data is not None:
+            cached[digests[position]] = spec_data
+    if errors:
+        raise RelayError(f"{len(errors)} problem(s) in plan issue files:\n" + "\n".join(f"- {e}" for e in errors))
+
+    if cache_path is not None and misses:
+        _save_spec_cache(cache_path, {digest: cached[digest] for digest in digests})
+    return [IssueSpec(**cached[digest]) for digest in digests]
+
+
+def _load_spec_cache(cache_path: Path | None) -> dict[str, dict[str, Any]]:
+    if cache_path is None:
+        return {}
+    try:
+        with cache_path.open("r", encoding="utf-8") as handle:
+            stored = json.load(handle) or {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if stored.get("version") != SPEC_CACHE_VERSION or not isinstance(stored.get("entries"), dict):
+        return {}
+    return stored["entries"]
+
+
+def _save_spec_cache(cache_path: Path, entries: dict[str, dict[str, Any]]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump({"version": SPEC_CACHE_VERSION, "entries": entries}, handle)
+    os.replace(tmp_path, cache_path)
 
 
 def load_constraints(plan_dir: Path) -> list[str]:
@@ -329,23 +1318,74 @@ def load_template(template_path: Path) -> str:
     return template_path.read_text(encoding="utf-8")
 
 
+ISSUE_FIELD_RENDERERS: dict[str, Callable[[IssueSpec], str]] = {
+    "id": lambda issue: issue.issue_id,
+    "title": lambda issue: issue.title,
+    "summary": lambda issue: issue.summary,
+    "scope": lambda issue: bullets(issue.scope, empty="(no scope items)"),
+    "non_goals": lambda issue: bullets(issue.non_goals, empty="(none)"),
+    "acceptance_criteria": lambda issue: bullets(issue.acceptance_criteria, empty="(none)"),
+    "verify": lambda issue: bullets(issue.verify, empty="(none)"),
+    "risk": lambda issue: issue.risk,
+    "depends_on": lambda issue: bullets(issue.depends_on, empty="(none)"),
+}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Issue template split into literal text around per-issue placeholders."""
+
+    literals: tuple[str, ...]
+    fields: tuple[str, ...]
+
+    def render(self, issue: IssueSpec) -> str:
+        parts = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            parts.append(ISSUE_FIELD_RENDERERS[field](issue))
+            parts.append(literal)
+        return "".join(parts).rstrip() + "\n"
+
+
+@functools.lru_cache(maxsize=8)
+def compile_template(template: str, constraints: tuple[str, ...]) -> CompiledTemplate:
+    # Constraints are the same for every issue, so they are folded into the literal text.
+    constants = {"constraints": bullets(list(constraints), empty="(none)")}
+    literals: list[str] = []
+    fields: list[str] = []
+    current: list[str] = []
+    position = 0
+    unknown: list[str] = []
+    for match in TEMPLATE_PLACEHOLDER_PATTERN.finditer(template):
+        current.append(template[position : match.start()])
+        position = match.end()
+        name = match.group(1)
+        if name in constants:
+            current.append(constants[name])
+        elif name in ISSUE_FIELD_RENDERERS:
+            literals.append("".join(current))
+            fields.append(name)
+            current = []
+        else:
+            unknown.append(name)
+    if unknown:
+        raise RelayError(f"Unknown placeholder(s) in issue template: {', '.join(dedupe(unknown))}")
+    current.append(template[position:])
+    literals.append("".join(current))
+    return CompiledTemplate(literals=tuple(literals), fields=tuple(fields))
+
+
 def render_issue_body(template: str, issue: IssueSpec, constraints: list[str]) -> str:
-    context = {
-        "id": issue.issue_id,
-        "title": issue.title,
-        "summary": issue.summary,
-        "scope": bullets(issue.scope, empty="(no scope items)"),
-        "non_goals": bullets(issue.non_goals, empty="(none)"),
-        "acceptance_criteria": bullets(issue.acceptance_criteria, empty="(none)"),
-        "verify": bullets(issue.verify, empty="(none)"),
-        "constraints": bullets(constraints, empty="(none)"),
-        "risk": issue.risk,
-        "depends_on": bullets(issue.depends_on, empty="(none)"),
-    }
-    body = template
-    for key, value in context.items():
-        body = body.replace(f"{{{{{key}}}}}", value)
-    return body.rstrip() + "\n"
+    return compile_template(template, tuple(constraints)).render(issue)
+
+
+def inputs_fingerprint(repo: str, template: str, constraints: list[str]) -> str:
+    payload = json.dumps({"repo": repo, "template": template, "constraints": constraints}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def spec_digest(title: str, body: str, labels: list[str], unresolved: list[str]) -> str:
+    payload = json.dumps({"title": title, "body": body, "labels": labels, "unresolved": unresolved}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 def find_issue_by_plan_id(repo: str, plan_id: str, token: str, api_base: str) -> dict[str, Any] | None:
@@ -360,16 +1400,147 @@ def find_issue_by_plan_id(repo: str, plan_id: str, token: str, api_base: str) ->
     return items[0]
 
 
-def ensure_label(repo: str, label: str, token: str, api_base: str) -> None:
+def build_plan_id_index(repo: str, token: str, api_base: str) -> dict[str, dict[str, Any]]:
+    index: dict[str, dict[str, Any]] = {}
+    page = 1
+    while True:
+        path = f"/repos/{repo}/issues?state=all&per_page={ISSUE_LIST_PAGE_SIZE}&page={page}"
+        items = api_request("GET", api_base, path, token)
+        if not isinstance(items, list):
+            raise RelayError(f"Unexpected issue list response: GET {path}")
+        for item in items:
+            # The issues endpoint also lists pull requests.
+            if "pull_request" in item:
+                continue
+            index_issue(index, item)
+        if len(items) < ISSUE_LIST_PAGE_SIZE:
+            return index
+        page += 1
+
+
+def index_issue(index: dict[str, dict[str, Any]], issue: dict[str, Any]) -> None:
+    plan_id = extract_plan_id_from_body(str(issue.get("body") or ""))
+    if not plan_id:
+        return
+    with _INDEX_LOCK:
+        current = index.get(plan_id)
+        # Keep the most recently updated issue if duplicates exist, like the search lookup.
+        if (
+            current is not None
+            and current.get("number") != issue.get("number")
+            and str(current.get("updated_at", "")) > str(issue.get("updated_at", ""))
+        ):
+            return
+        index[plan_id] = issue
+
+
+def build_search_index(
+    repo: str,
+    plan_ids: list[str],
+    token: str,
+    api_base: str,
+) -> dict[str, dict[str, Any]]:
+    # One Search API call per Plan-ID, made once up front so later lookups share the result.
+    index: dict[str, dict[str, Any]] = {}
+    for plan_id in dedupe(plan_ids):
+        issue = find_issue_by_plan_id(repo, plan_id, token, api_base)
+        if issue:
+            index[plan_id] = issue
+    return index
+
+
+def fetch_repo_labels(repo: str, token: str, api_base: str) -> dict[str, dict[str, Any]]:
+    # Label names are case-insensitive on GitHub.
+    labels: dict[str, dict[str, Any]] = {}
+    page = 1
+    while True:
+        path = f"/repos/{repo}/labels?per_page={ISSUE_LIST_PAGE_SIZE}&page={page}"
+        items = api_request("GET", api_base, path, token)
+        if not isinstance(items, list):
+            raise RelayError(f"Unexpected label list response: GET {path}")
+        for item in items:
+            name = str(item.get("name", ""))
+            if name:
+                labels[name.lower()] = item
+        if len(items) < ISSUE_LIST_PAGE_SIZE:
+            return labels
+        page += 1
+
+
+def label_style_updates(labels: dict[str, dict[str, Any]]) -> list[dict[str, str]]:
+    """Managed labels whose color or description drifted from LABEL_STYLES."""
+    updates: list[dict[str, str]] = []
+    for name, style in LABEL_STYLES.items():
+        current = labels.get(name.lower())
+        if current is None:
+            continue
+        if (
+            str(current.get("color", "")).lower() == style["color"]
+            and str(current.get("description") or "") == style["description"]
+        ):
+            continue
+        updates.append({"name": str(current["name"]), "color": style["color"], "description": style["description"]})
+    return updates
+
+
+def apply_label_style_updates(
+    repo: str,
+    token: str,
+    api_base: str,
+    labels: dict[str, dict[str, Any]],
+    updates: list[dict[str, str]],
+) -> None:
+    for update in updates:
+        path = f"/repos/{repo}/labels/{parse.quote(update['name'], safe='')}"
+        payload = {"color": update["color"], "description": update["description"]}
+        updated = api_request("PATCH", api_base, path, token, payload)
+        current = labels.get(update["name"].lower(), {"name": update["name"]})
+        labels[update["name"].lower()] = updated if isinstance(updated, dict) and updated else {**current, **payload}
+
+
+def reconcile_label_styles(repo: str, token: str, api_base: str, labels: dict[str, dict[str, Any]]) -> None:
+    apply_label_style_updates(repo, token, api_base, labels, label_style_updates(labels))
+
+
+def ensure_label(
+    repo: str,
+    label: str,
+    token: str,
+    api_base: str,
+    known_labels: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    if known_labels is not None and label.lower() in known_labels:
+        return
     style = LABEL_STYLES.get(label, DEFAULT_LABEL_STYLE)
     payload = {"name": label, "color": style["color"], "description": style["description"]}
-    try:
-        api_request("POST", api_base, f"/repos/{repo}/labels", token, payload)
-    except GitHubApiError as exc:
-        # 422 means already exists.
-        if exc.status == 422:
+    with _LABELS_LOCK:
+        # Re-check under the lock so concurrent workers create each label once.
+        if known_labels is not None and label.lower() in known_labels:
             return
-        raise
+        try:
+            created = api_request("POST", api_base, f"/repos/{repo}/labels", token, payload)
+        except GitHubApiError as exc:
+            # 422 means already exists.
+            if exc.status != 422:
+                raise
+            created = payload
+        if known_labels is not None:
+            known_labels[label.lower()] = created if isinstance(created, dict) and created else payload
+
+
+def normalize_body(body: str) -> str:
+    # GitHub may store bodies edited in the web UI with CRLF line endings.
+    return (body or "").replace("\r\n", "\n").rstrip() + "\n"
+
+
+def issue_matches(existing: dict[str, Any], title: str, body: str, labels: list[str]) -> bool:
+    existing_labels = {str(label.get("name", "")).strip() for label in existing.get("labels", [])}
+    existing_labels.discard("")
+    return (
+        str(existing.get("title", "")) == title
+        and normalize_body(str(existing.get("body") or "")) == normalize_body(body)
+        and existing_labels == set(labels)
+    )
 
 
 def calc_final_labels(existing_labels: list[str], desired_labels: list[str]) -> list[str]:
@@ -377,28 +1548,127 @@ def calc_final_labels(existing_labels: list[str], desired_labels: list[str]) ->
     return dedupe(preserved + desired_labels)
 
 
-def dependency_status(
-    repo: str,
-    depends_on: list[str],
-    token: str,
-    api_base: str,
-) -> tuple[bool, list[str]]:
-    if not depends_on:
-        return True, []
-
-    unresolved: list[str] = []
-    for dep_plan_id in depends_on:
-        dep_issue = find_issue_by_plan_id(repo, dep_plan_id, token, api_base)
-        if not dep_issue:
-            unresolved.append(f"{dep_plan_id}: not found")
-            continue
+def build_dependency_graph(issue_specs: list[IssueSpec]) -> DependencyGraph:
+    """Order specs so dependencies come first; fail on duplicate IDs and cycles."""
+    positions: dict[str, int] = {}
+    duplicates: list[str] = []
+    for position, spec in enumerate(issue_specs):
+        if spec.issue_id in positions:
+            duplicates.append(spec.issue_id)
+        positions.setdefault(spec.issue_id, position)
+    if duplicates:
+        raise RelayError(f"Duplicate Plan-ID in plan issues: {', '.join(dedupe(duplicates))}")
+
+    depends_on = {spec.issue_id: dedupe(spec.depends_on) for spec in issue_specs}
+    dependents: dict[str, list[str]] = {plan_id: [] for plan_id in depends_on}
+    dangling: dict[str, list[str]] = {}
+    pending = {plan_id: 0 for plan_id in depends_on}
+    for plan_id, deps in depends_on.items():
+        for dep in deps:
+            if dep in depends_on:
+                dependents[dep].append(plan_id)
+                pending[plan_id] += 1
+            else:
+                dangling.setdefault(plan_id, []).append(dep)
+
+    # Kahn's algorithm; ties keep the filename order of the specs.
+    ready = [(positions[plan_id], plan_id) for plan_id, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    order: list[str] = []
+    while ready:
+        _, plan_id = heapq.heappop(ready)
+        order.append(plan_id)
+        for child in dependents[plan_id]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                heapq.heappush(ready, (positions[child], child))
+
+    if len(order) < len(depends_on):
+        cycles = _find_cycles({plan_id for plan_id, count in pending.items() if count > 0}, depends_on)
+        rendered = "; ".join(" -> ".join(cycle + [cycle[0]]) for cycle in cycles)
+        raise RelayError(f"Dependency cycle in plan issues: {rendered}")
+
+    return DependencyGraph(order=order, depends_on=depends_on, dependents=dependents, dangling=dangling)
+
+
+def _find_cycles(stuck: set[str], depends_on: dict[str, list[str]]) -> list[list[str]]:
+    # Every stuck node still waits on another stuck node, so following those edges must loop.
+    cycles: list[list[str]] = []
+    seen_cycles: set[frozenset[str]] = set()
+    visited: set[str] = set()
+    for start in sorted(stuck):
+        path: list[str] = []
+        node = start
+        while node not in path and node not in visited:
+            path.append(node)
+            node = next(dep for dep in depends_on[node] if dep in stuck)
+        visited.update(path)
+        if node in path:
+            cycle = path[path.index(node) :]
+            if frozenset(cycle) not in seen_cycles:
+                seen_cycles.add(frozenset(cycle))
+                cycles.append(cycle)
+    return cycles
+
+
+def dependency_warnings(graph: DependencyGraph) -> list[str]:
+    return [
+        f"Plan-ID {plan_id} depends on {', '.join(deps)} outside the plan (resolved from existing issues)"
+        for plan_id, deps in graph.dangling.items()
+    ]
+
+
+def is_kept_closed(
+    plan_id: str,
+    issue: dict[str, Any] | None,
+    closed_trigger_issue_number: int | None = None,
+    closed_trigger_plan_id: str = "",
+) -> bool:
+    if not issue or str(issue.get("state", "")).lower() != "closed":
+        return False
+    return bool(
+        (closed_trigger_issue_number is not None and issue.get("number") == closed_trigger_issue_number)
+        or (closed_trigger_plan_id and plan_id == closed_trigger_plan_id)
+    )
 
-        state = str(dep_issue.get("state", "")).lower()
-        number = dep_issue.get("number")
-        if state != "closed":
-            unresolved.append(f"{dep_plan_id}: open#{number}")
 
-    return len(unresolved) == 0, unresolved
+def resolve_dependencies(
+    graph: DependencyGraph,
+    issue_index: dict[str, dict[str, Any]],
+    closed_trigger_issue_number: int | None = None,
+    closed_trigger_plan_id: str = "",
+) -> dict[str, list[str]]:
+    """Return the unresolved dependencies of every spec from one snapshot of issue states.
+
+    States are projected to the end of this run: plan issues are created or reopened
+    unless kept closed for the issues.closed trigger, so a dependency only counts as
+    done when it stays closed. Blockers behind a closed dependency are inherited.
+    """
+
+    def blocker(dep: str) -> str:
+        issue = issue_index.get(dep)
+        if dep in graph.depends_on:
+            if is_kept_closed(dep, issue, closed_trigger_issue_number, closed_trigger_plan_id):
+                return ""
+            return f"{dep}: open#{issue.get('number')}" if issue else f"{dep}: to be created"
+        if not issue:
+            return f"{dep}: not found"
+        if str(issue.get("state", "")).lower() == "closed":
+            return ""
+        return f"{dep}: open#{issue.get('number')}"
+
+    blockers: dict[str, dict[str, str]] = {}
+    for plan_id in graph.order:
+        found: dict[str, str] = {}
+        for dep in graph.depends_on[plan_id]:
+            text = blocker(dep)
+            if text:
+                found.setdefault(dep, text)
+                continue
+            for upstream, upstream_text in blockers.get(dep, {}).items():
+                found.setdefault(upstream, f"{upstream_text} (via {dep})")
+        blockers[plan_id] = found
+    return {plan_id: list(found.values()) for plan_id, found in blockers.items()}
 
 
 def desired_labels_for_issue(spec: IssueSpec, deps_resolved: bool) -> list[str]:
@@ -413,14 +1683,50 @@ def desired_labels_for_issue(spec: IssueSpec, deps_resolved: bool) -> list[str]:
     return dedupe(labels)
 
 
-def write_summary(lines: list[str]) -> None:
+def write_summary(lines: list[str], details: list[str] | None = None) -> None:
     summary_path = os.getenv("GITHUB_STEP_SUMMARY")
     if not summary_path:
         return
+    if details is None:
+        details = _METRICS.summary_markdown()
     with open(summary_path, "a", encoding="utf-8") as handle:
         handle.write("## Relay Result\n\n")
         for line in lines:
             handle.write(f"- {line}\n")
+        if details:
+            handle.write("\n" + "\n".join(details) + "\n")
+
+
+def report_results(args: argparse.Namespace, lines: list[str]) -> None:
+    """Write the run result to --results-file for a later merge, or straight to the step summary."""
+    if not args.results_file:
+        write_summary(lines)
+        return
+    shard = f"{args.shard[0]}/{args.shard[1]}" if args.shard else ""
+    results = {"version": RESULTS_VERSION, "shard": shard, "lines": lines, "metrics": _METRICS.summary_markdown()}
+    write_json_file(Path(args.results_file), results)
+
+
+def merge_results(paths: list[str]) -> tuple[list[str], list[str]]:
+    """Combine per-shard results files into summary lines and per-shard metric tables."""
+    lines: list[str] = []
+    details: list[str] = []
+    totals: dict[str, int] = {}
+    for path in sorted(paths):
+        results = read_json_file(Path(path), RESULTS_VERSION, "results file")
+        label = f"shard {results['shard']}" if results.get("shard") else path
+        for line in results.get("lines") or []:
+            if line.startswith("Totals:"):
+                for key, value in TOTALS_PATTERN.findall(line):
+                    totals[key] = totals.get(key, 0) + int(value)
+            else:
+                lines.append(line)
+        if results.get("metrics"):
+            details += [f"#### {label}", ""] + list(results["metrics"]) + [""]
+    if totals:
+        lines.append("Totals: " + " ".join(f"{key}={value}" for key, value in totals.items()))
+    lines.append(f"Merged {len(paths)} results file(s).")
+    return lines, details
 
 
 def extract_plan_id_from_body(body: str) -> str:
@@ -463,6 +1769,190 @@ def load_closed_issue_trigger() -> tuple[int | None, str]:
     return issue_number, plan_id
 
 
+def plan_issue_change(
+    spec: IssueSpec,
+    body: str,
+    desired_labels: list[str],
+    unresolved: list[str],
+    digest: str,
+    existing: dict[str, Any] | None,
+    closed_trigger_issue_number: int | None = None,
+    closed_trigger_plan_id: str = "",
+) -> IssueChange:
+    if not existing:
+        return IssueChange(
+            plan_id=spec.issue_id,
+            action="create",
+            title=spec.title,
+            body=body,
+            labels=desired_labels,
+            new_labels=desired_labels,
+            unresolved=unresolved,
+            digest=digest,
+        )
+
+    existing_labels = [str(label.get("name", "")).strip() for label in existing.get("labels", [])]
+    existing_labels = [label for label in existing_labels if label]
+    final_labels = calc_final_labels(existing_labels, desired_labels)
+    number = int(existing["number"])
+    state = str(existing.get("state", "")).lower()
+    skip_reopen = is_kept_closed(spec.issue_id, existing, closed_trigger_issue_number, closed_trigger_plan_id)
+
+    if skip_reopen:
+        # Not recorded in the manifest: the next push reopens the issue.
+        action = "keep-closed"
+        digest = ""
+    elif issue_matches(existing, spec.title, body, final_labels):
+        action = "reopen" if state == "closed" else "noop"
+    else:
+        action = "update"
+
+    return IssueChange(
+        plan_id=spec.issue_id,
+        action=action,
+        title=spec.title,
+        body=body,
+        labels=final_labels,
+        # Labels already on the issue exist in the repository.
+        new_labels=[label for label in final_labels if label not in existing_labels],
+        unresolved=unresolved,
+        digest=digest,
+        number=number,
+        node_id=str(existing.get("node_id", "")),
+        reopen=state == "closed" and not skip_reopen,
+    )
+
+
+def change_outcome(change: IssueChange, number: int) -> SyncOutcome:
+    if change.action == "create":
+        status, msg = "created", f"Created issue #{number} for Plan-ID {change.plan_id}"
+    elif change.action == "keep-closed":
+        status = "unchanged"
+        msg = (
+            f"Kept closed issue #{number} for Plan-ID {change.plan_id} "
+            "(skip reopen on issues.closed trigger)"
+        )
+    elif change.action == "noop":
+        status, msg = "unchanged", f"Unchanged issue #{number} for Plan-ID {change.plan_id}"
+    elif change.action == "reopen":
+        status, msg = "updated", f"Reopened issue #{number} for Plan-ID {change.plan_id}"
+    else:
+        msg_prefix = "Reopened and updated" if change.reopen else "Updated"
+        status, msg = "updated", f"{msg_prefix} issue #{number} for Plan-ID {change.plan_id}"
+
+    if change.unresolved:
+        msg += f" (blocked by: {', '.join(change.unresolved)})"
+    print(msg)
+    return SyncOutcome(status, msg, number, change.digest)
+
+
+def apply_issue_change(
+    repo: str,
+    token: str,
+    api_base: str,
+    change: IssueChange,
+    issue_index: dict[str, dict[str, Any]] | None = None,
+    repo_labels: dict[str, dict[str, Any]] | None = None,
+) -> SyncOutcome:
+    if change.action in {"noop", "keep-closed"}:
+        return change_outcome(change, int(change.number or 0))
+
+    for label in change.new_labels:
+        ensure_label(repo, label, token, api_base, repo_labels)
+
+    if change.action == "create":
+        payload = {"title": change.title, "body": change.body, "labels": change.labels}
+        result = api_request("POST", api_base, f"/repos/{repo}/issues", token, payload)
+    else:
+        payload = {"state": "open"} if change.reopen else {}
+        if change.action == "update":
+            payload.update({"title": change.title, "body": change.body, "labels": change.labels})
+        result = api_request("PATCH", api_base, f"/repos/{repo}/issues/{change.number}", token, payload)
+
+    if issue_index is not None and isinstance(result, dict) and result:
+        index_issue(issue_index, result)
+    number = int(result["number"]) if change.action == "create" else int(change.number or 0)
+    return change_outcome(change, number)
+
+
+def sync_issue(
+    repo: str,
+    token: str,
+    api_base: str,
+    spec: IssueSpec,
+    template: str,
+    constraints: list[str],
+    dry_run: bool,
+    issue_index: dict[str, dict[str, Any]],
+    unresolved: list[str],
+    closed_trigger_issue_number: int | None = None,
+    closed_trigger_plan_id: str = "",
+    manifest: SyncManifest | None = None,
+    repo_labels: dict[str, dict[str, Any]] | None = None,
+) -> SyncOutcome:
+    prepared = prepare_issue_change(
+        spec=spec,
+        template=template,
+        constraints=constraints,
+        dry_run=dry_run,
+        issue_index=issue_index,
+        unresolved=unresolved,
+        closed_trigger_issue_number=closed_trigger_issue_number,
+        closed_trigger_plan_id=closed_trigger_plan_id,
+        manifest=manifest,
+    )
+    if isinstance(prepared, SyncOutcome):
+        return prepared
+    return apply_issue_change(repo, token, api_base, prepared, issue_index, repo_labels)
+
+
+def prepare_issue_change(
+    spec: IssueSpec,
+    template: str,
+    constraints: list[str],
+    dry_run: bool,
+    issue_index: dict[str, dict[str, Any]],
+    unresolved: list[str],
+    closed_trigger_issue_number: int | None = None,
+    closed_trigger_plan_id: str = "",
+    manifest: SyncManifest | None = None,
+) -> IssueChange | SyncOutcome:
+    """Resolve a spec into the change to apply, or an outcome when no write is needed."""
+    with _METRICS.phase("render"):
+        body = render_issue_body(template, spec, constraints)
+    desired_labels = desired_labels_for_issue(spec, not unresolved)
+
+    if dry_run:
+        print(f"[DRY-RUN] Plan-ID={spec.issue_id} title={spec.title}")
+        print(f"[DRY-RUN] labels={desired_labels}")
+        if unresolved:
+            print(f"[DRY-RUN] blocked_by={unresolved}")
+        print("[DRY-RUN] body:")
+        print(body)
+        print("-" * 60)
+        return SyncOutcome("dry-run", f"DRY-RUN: {spec.issue_id}")
+
+    digest = spec_digest(spec.title, body, desired_labels, unresolved)
+    if manifest is not None:
+        current_number = manifest.is_current(spec.issue_id, digest, issue_index, spec.title, body, desired_labels)
+        if current_number is not None:
+            msg = f"Unchanged issue #{current_number} for Plan-ID {spec.issue_id} (manifest)"
+            print(msg)
+            return SyncOutcome("unchanged", msg, current_number, digest)
+
+    existing = issue_index.get(spec.issue_id)
+    return plan_issue_change(
+        spec,
+        body,
+        desired_labels,
+        unresolved,
+        digest,
+        existing,
+        closed_trigger_issue_number,
+        closed_trigger_plan_id,
+    )
+
+
 def sync_issues(
     repo: str,
     token: str,
@@ -473,105 +1963,626 @@ def sync_issues(
     dry_run: bool,
     closed_trigger_issue_number: int | None = None,
     closed_trigger_plan_id: str = "",
+    issue_index: dict[str, dict[str, Any]] | None = None,
+    concurrency: int = 1,
+    manifest: SyncManifest | None = None,
+    repo_labels: dict[str, dict[str, Any]] | None = None,
+    graph: DependencyGraph | None = None,
 ) -> list[str]:
-    result_lines: list[str] = []
-    for index, spec in enumerate(issue_specs):
-        body = render_issue_body(template, spec, constraints)
-        deps_resolved, unresolved = dependency_status(
+    if graph is None:
+        graph = build_dependency_graph(issue_specs)
+    if issue_index is None:
+        issue_index = build_search_index(repo, graph.referenced_ids(), token, api_base)
+    with _METRICS.phase("dependencies"):
+        unresolved = resolve_dependencies(graph, issue_index, closed_trigger_issue_number, closed_trigger_plan_id)
+    specs_by_id = {spec.issue_id: spec for spec in issue_specs}
+
+    # The graph may cover more specs than are synced; their states still feed dependency resolution.
+    order = [plan_id for plan_id in graph.order if plan_id in specs_by_id]
+
+    def run_one(position: int) -> SyncOutcome:
+        spec = specs_by_id[order[position]]
+        result = sync_issue(
             repo=repo,
-            depends_on=spec.depends_on,
             token=token,
             api_base=api_base,
+            spec=spec,
+            template=template,
+            constraints=constraints,
+            dry_run=dry_run,
+            issue_index=issue_index,
+            unresolved=unresolved[spec.issue_id],
+            closed_trigger_issue_number=closed_trigger_issue_number,
+            closed_trigger_plan_id=closed_trigger_plan_id,
+            manifest=manifest,
+            repo_labels=repo_labels,
+        )
+        if manifest is not None and result.digest and result.number is not None:
+            manifest.record(spec.issue_id, result.digest, result.number)
+        if result.status != "unchanged" and not dry_run and ISSUE_SYNC_SLEEP_SECONDS > 0 and position < len(order) - 1:
+            print(f"Sleeping {ISSUE_SYNC_SLEEP_SECONDS} seconds before next issue sync...")
+            _METRICS.add_sleep("issue_sync", ISSUE_SYNC_SLEEP_SECONDS)
+            time.sleep(ISSUE_SYNC_SLEEP_SECONDS)
+        return result
+
+    # Dependency state is resolved up front, so workers need not wait for each other.
+    positions = range(len(order))
+    if dry_run or concurrency <= 1:
+        processed = [run_one(position) for position in positions]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            processed = list(pool.map(run_one, positions))
+
+    by_id = dict(zip(order, processed))
+    outcomes = [by_id[spec.issue_id] for spec in issue_specs]
+    return summarize_outcomes(outcomes, dry_run)
+
+
+def summarize_outcomes(outcomes: list[SyncOutcome], dry_run: bool = False) -> list[str]:
+    result_lines = [outcome.message for outcome in outcomes]
+    if not dry_run:
+        statuses = [outcome.status for outcome in outcomes]
+        totals = (
+            f"Totals: created={statuses.count('created')} "
+            f"updated={statuses.count('updated')} unchanged={statuses.count('unchanged')}"
         )
-        desired_labels = desired_labels_for_issue(spec, deps_resolved)
-
-        if dry_run:
-            print(f"[DRY-RUN] Plan-ID={spec.issue_id} title={spec.title}")
-            print(f"[DRY-RUN] labels={desired_labels}")
-            if unresolved:
-                print(f"[DRY-RUN] blocked_by={unresolved}")
-            print("[DRY-RUN] body:")
-            print(body)
-            print("-" * 60)
-            result_lines.append(f"DRY-RUN: {spec.issue_id}")
+        print(totals)
+        result_lines.insert(0, totals)
+    return result_lines
+
+
+def graphql_api_base(api_base: str) -> str:
+    base = api_base.rstrip("/")
+    # GitHub Enterprise Server serves REST at /api/v3 and GraphQL at /api/graphql.
+    if base.endswith("/api/v3"):
+        return base[: -len("/v3")]
+    return base
+
+
+def graphql_request(
+    api_base: str,
+    token: str,
+    query: str,
+    variables: dict[str, Any],
+    writes: int = 0,
+) -> dict[str, Any]:
+    payload = {"query": query, "variables": variables}
+    for attempt in range(API_MAX_RETRIES + 1):
+        result = api_request("POST", graphql_api_base(api_base), "/graphql", token, payload, writes=writes)
+        data = result.get("data") or {}
+        _record_graphql_rate_limit(data.get("rateLimit"))
+        # Aliases that returned data have already run; resending the document would repeat them.
+        ran = any(value is not None for key, value in data.items() if key != "rateLimit")
+        if attempt < API_MAX_RETRIES and not ran and _graphql_rate_limited_aliases(result):
+            _sleep_for_graphql_rate_limit(attempt)
             continue
+        return result
+    raise RelayError("GraphQL request retries exhausted")
 
-        existing = find_issue_by_plan_id(repo, spec.issue_id, token, api_base)
-        existing_labels: list[str] = []
-        if existing:
-            existing_labels = [str(label.get("name", "")).strip() for label in existing.get("labels", [])]
-            existing_labels = [label for label in existing_labels if label]
 
-        final_labels = calc_final_labels(existing_labels, desired_labels)
-        for label in final_labels:
-            ensure_label(repo, label, token, api_base)
+def _graphql_rate_limited_aliases(result: dict[str, Any]) -> set[str]:
+    return {
+        str((err.get("path") or [""])[0]) for err in result.get("errors") or [] if err.get("type") == "RATE_LIMITED"
+    }
 
-        payload = {"title": spec.title, "body": body, "labels": final_labels}
 
-        if existing:
-            number = int(existing["number"])
-            state = str(existing.get("state", "")).lower()
-            skip_reopen = state == "closed" and (
-                (closed_trigger_issue_number is not None and number == closed_trigger_issue_number)
-                or (closed_trigger_plan_id and spec.issue_id == closed_trigger_plan_id)
-            )
+def _sleep_for_graphql_rate_limit(attempt: int) -> None:
+    budget = _RATE_BUDGETS["graphql"]
+    delay = budget.reset_at - time.time() + 1 if budget.reset_at else API_BACKOFF_SECONDS * (2**attempt)
+    delay = min(max(1.0, delay), API_MAX_BACKOFF_SECONDS)
+    print(f"GraphQL rate limited. Sleeping {delay:.1f}s before retry {attempt + 1}/{API_MAX_RETRIES}.")
+    _METRICS.add_sleep("retry", delay)
+    time.sleep(delay)
 
-            if skip_reopen:
-                msg = (
-                    f"Kept closed issue #{number} for Plan-ID {spec.issue_id} "
-                    "(skip reopen on issues.closed trigger)"
-                )
-                if unresolved:
-                    msg += f" (blocked by: {', '.join(unresolved)})"
-                print(msg)
-                result_lines.append(msg)
-            else:
-                reopened = False
-                if state == "closed":
-                    api_request("PATCH", api_base, f"/repos/{repo}/issues/{number}", token, {"state": "open"})
-                    reopened = True
-
-                api_request("PATCH", api_base, f"/repos/{repo}/issues/{number}", token, payload)
-                msg_prefix = "Reopened and updated" if reopened else "Updated"
-                msg = f"{msg_prefix} issue #{number} for Plan-ID {spec.issue_id}"
-                if unresolved:
-                    msg += f" (blocked by: {', '.join(unresolved)})"
-                print(msg)
-                result_lines.append(msg)
+
+def _record_graphql_rate_limit(rate_limit: dict[str, Any] | None) -> None:
+    if not rate_limit:
+        return
+    try:
+        reset_at = datetime.fromisoformat(str(rate_limit["resetAt"]).replace("Z", "+00:00")).timestamp()
+        remaining = int(rate_limit["remaining"])
+        limit = int(rate_limit["limit"])
+    except (KeyError, TypeError, ValueError):
+        return
+    with _THROTTLE_LOCK:
+        budget = _RATE_BUDGETS["graphql"]
+        budget.remaining = remaining
+        budget.limit = limit
+        budget.reset_at = reset_at
+
+
+def _graphql_errors(result: dict[str, Any]) -> str:
+    return "; ".join(str(err.get("message", err)) for err in result.get("errors") or [])
+
+
+def _issue_from_graphql(node: dict[str, Any]) -> dict[str, Any]:
+    # Same shape as a REST issue so the index, diff and manifest code is shared.
+    return {
+        "node_id": node.get("id", ""),
+        "number": node.get("number"),
+        "title": node.get("title", ""),
+        "body": node.get("body") or "",
+        "state": str(node.get("state", "")).lower(),
+        "updated_at": node.get("updatedAt", ""),
+        "labels": [{"name": label.get("name", "")} for label in (node.get("labels") or {}).get("nodes") or []],
+    }
+
+
+def fetch_graphql_snapshot(
+    repo: str,
+    token: str,
+    api_base: str,
+) -> tuple[str, dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Return the repository node ID, the Plan-ID index and the label map in as few queries as possible."""
+    owner, _, name = repo.partition("/")
+    variables: dict[str, Any] = {
+        "owner": owner,
+        "name": name,
+        "issuesAfter": None,
+        "labelsAfter": None,
+        "withIssues": True,
+        "withLabels": True,
+    }
+    repository_id = ""
+    index: dict[str, dict[str, Any]] = {}
+    labels: dict[str, dict[str, Any]] = {}
+    while variables["withIssues"] or variables["withLabels"]:
+        result = graphql_request(api_base, token, GRAPHQL_SNAPSHOT_QUERY, variables)
+        repository = (result.get("data") or {}).get("repository")
+        if result.get("errors") or not repository:
+            raise GitHubApiError(200, "POST", "/graphql", _graphql_errors(result) or f"repository {repo} not found")
+        repository_id = str(repository.get("id", ""))
+
+        if variables["withIssues"]:
+            connection = repository["issues"]
+            for node in connection.get("nodes") or []:
+                index_issue(index, _issue_from_graphql(node))
+            variables["withIssues"] = bool(connection["pageInfo"]["hasNextPage"])
+            variables["issuesAfter"] = connection["pageInfo"]["endCursor"]
+        if variables["withLabels"]:
+            connection = repository["labels"]
+            for node in connection.get("nodes") or []:
+                labels[str(node["name"]).lower()] = {
+                    "node_id": node.get("id", ""),
+                    "name": node["name"],
+                    "color": node.get("color", ""),
+                    "description": node.get("description") or "",
+                }
+            variables["withLabels"] = bool(connection["pageInfo"]["hasNextPage"])
+            variables["labelsAfter"] = connection["pageInfo"]["endCursor"]
+    return repository_id, index, labels
+
+
+def label_node_ids(
+    repo: str,
+    token: str,
+    api_base: str,
+    names: list[str],
+    repo_labels: dict[str, dict[str, Any]],
+) -> list[str]:
+    node_ids: list[str] = []
+    for name in names:
+        ensure_label(repo, name, token, api_base, repo_labels)
+        label = repo_labels[name.lower()]
+        if not label.get("node_id"):
+            # Created concurrently elsewhere (422): look it up once.
+            label = api_request("GET", api_base, f"/repos/{repo}/labels/{parse.quote(name, safe='')}", token)
+            repo_labels[name.lower()] = label
+        node_ids.append(str(label["node_id"]))
+    return node_ids
+
+
+def submit_graphql_batch(
+    repo: str,
+    token: str,
+    api_base: str,
+    repository_id: str,
+    batch: list[IssueChange],
+    repo_labels: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    """Send one mutation document; the mutation for batch[i] is aliased m<i>."""
+    definitions: list[str] = []
+    fields: list[str] = []
+    variables: dict[str, Any] = {}
+    for position, change in enumerate(batch):
+        mutation_input: dict[str, Any] = {}
+        if change.action != "reopen":
+            mutation_input = {
+                "title": change.title,
+                "body": change.body,
+                "labelIds": label_node_ids(repo, token, api_base, change.labels, repo_labels),
+            }
+        if change.action == "create":
+            mutation_input["repositoryId"] = repository_id
+            definitions.append(f"$input{position}: CreateIssueInput!")
+            fields.append(f"m{position}: createIssue(input: $input{position}) {{ issue {{ {GRAPHQL_ISSUE_FIELDS} }} }}")
+        else:
+            mutation_input["id"] = change.node_id
+            if change.reopen:
+                mutation_input["state"] = "OPEN"
+            definitions.append(f"$input{position}: UpdateIssueInput!")
+            fields.append(f"m{position}: updateIssue(input: $input{position}) {{ issue {{ {GRAPHQL_ISSUE_FIELDS} }} }}")
+        variables[f"input{position}"] = mutation_input
+
+    query = f"mutation({', '.join(definitions)}) {{\n  " + "\n  ".join(fields) + "\n}"
+    return graphql_request(api_base, token, query, variables, writes=len(batch))
+
+
+def apply_graphql_changes(
+    repo: str,
+    token: str,
+    api_base: str,
+    repository_id: str,
+    changes: list[IssueChange],
+    issue_index: dict[str, dict[str, Any]],
+    repo_labels: dict[str, dict[str, Any]],
+    manifest: SyncManifest | None = None,
+) -> dict[str, SyncOutcome]:
+    outcomes: dict[str, SyncOutcome] = {}
+    failures: list[str] = []
+    for start in range(0, len(changes), max(1, GRAPHQL_BATCH_SIZE)):
+        batch = changes[start : start + max(1, GRAPHQL_BATCH_SIZE)]
+        for attempt in range(API_MAX_RETRIES + 1):
+            result = submit_graphql_batch(repo, token, api_base, repository_id, batch, repo_labels)
+            data = result.get("data") or {}
+            failed_aliases = {str((err.get("path") or [""])[0]) for err in result.get("errors") or []}
+            if not failed_aliases <= {f"m{position}" for position in range(len(batch))}:
+                # Not tied to a single mutation: the whole document was rejected.
+                raise GitHubApiError(200, "POST", "/graphql", _graphql_errors(result))
+            rate_limited = _graphql_rate_limited_aliases(result) if attempt < API_MAX_RETRIES else set()
+            retry: list[IssueChange] = []
+            # Mutations in one document run independently, so keep the ones that succeeded.
+            for position, change in enumerate(batch):
+                issue = (data.get(f"m{position}") or {}).get("issue")
+                if not issue:
+                    if f"m{position}" in rate_limited:
+                        retry.append(change)
+                    else:
+                        failures.append(change.plan_id)
+                    continue
+                index_issue(issue_index, _issue_from_graphql(issue))
+                outcomes[change.plan_id] = change_outcome(change, int(issue["number"]))
+                if manifest is not None and change.digest:
+                    # Journaled per batch so a cancelled run does not repeat finished batches.
+                    manifest.record(change.plan_id, change.digest, int(issue["number"]))
+            if result.get("errors"):
+                print(f"GraphQL mutation errors: {_graphql_errors(result)}")
+            if not retry:
+                break
+            # Only the rate-limited mutations are sent again; the rest already ran.
+            batch = retry
+            _sleep_for_graphql_rate_limit(attempt)
+
+    if failures:
+        raise RelayError(f"GraphQL mutations failed for Plan-IDs: {', '.join(failures)}")
+    return outcomes
+
+
+def sync_issues_graphql(
+    repo: str,
+    token: str,
+    api_base: str,
+    repository_id: str,
+    issue_specs: list[IssueSpec],
+    template: str,
+    constraints: list[str],
+    issue_index: dict[str, dict[str, Any]],
+    repo_labels: dict[str, dict[str, Any]],
+    closed_trigger_issue_number: int | None = None,
+    closed_trigger_plan_id: str = "",
+    manifest: SyncManifest | None = None,
+    graph: DependencyGraph | None = None,
+) -> list[str]:
+    if graph is None:
+        graph = build_dependency_graph(issue_specs)
+    with _METRICS.phase("dependencies"):
+        unresolved = resolve_dependencies(graph, issue_index, closed_trigger_issue_number, closed_trigger_plan_id)
+    prepared: list[IssueChange | SyncOutcome] = [
+        prepare_issue_change(
+            spec=spec,
+            template=template,
+            constraints=constraints,
+            dry_run=False,
+            issue_index=issue_index,
+            unresolved=unresolved[spec.issue_id],
+            closed_trigger_issue_number=closed_trigger_issue_number,
+            closed_trigger_plan_id=closed_trigger_plan_id,
+            manifest=manifest,
+        )
+        for spec in issue_specs
+    ]
+    # Creates go out in dependency order so dependency issues get the lower numbers.
+    positions = {plan_id: position for position, plan_id in enumerate(graph.order)}
+    writes = sorted(
+        (item for item in prepared if isinstance(item, IssueChange) and item.action in {"create", "update", "reopen"}),
+        key=lambda item: positions[item.plan_id],
+    )
+    applied = apply_graphql_changes(repo, token, api_base, repository_id, writes, issue_index, repo_labels, manifest)
+
+    outcomes: list[SyncOutcome] = []
+    for spec, item in zip(issue_specs, prepared):
+        if isinstance(item, SyncOutcome):
+            outcome = item
+        elif item.plan_id in applied:
+            outcome = applied[item.plan_id]
         else:
-            created = api_request("POST", api_base, f"/repos/{repo}/issues", token, payload)
-            number = int(created["number"])
-            msg = f"Created issue #{number} for Plan-ID {spec.issue_id}"
-            if unresolved:
-                msg += f" (blocked by: {', '.join(unresolved)})"
+            outcome = change_outcome(item, int(item.number or 0))
+        if manifest is not None and outcome.digest and outcome.number is not None:
+            manifest.record(spec.issue_id, outcome.digest, outcome.number)
+        outcomes.append(outcome)
+    return summarize_outcomes(outcomes)
+
+
+def build_change_plan(
+    snapshot: IssueSnapshot,
+    issue_specs: list[IssueSpec],
+    template: str,
+    constraints: list[str],
+    graph: DependencyGraph,
+    closed_trigger_issue_number: int | None = None,
+    closed_trigger_plan_id: str = "",
+) -> dict[str, Any]:
+    """Compute every write a sync would make against `snapshot`, without touching the API."""
+    with _METRICS.phase("dependencies"):
+        unresolved = resolve_dependencies(graph, snapshot.issues, closed_trigger_issue_number, closed_trigger_plan_id)
+    specs_by_id = {spec.issue_id: spec for spec in issue_specs}
+    changes: list[IssueChange] = []
+    # Stored in dependency order so apply creates dependency issues first.
+    for plan_id in graph.order:
+        if plan_id not in specs_by_id:
+            continue
+        spec = specs_by_id[plan_id]
+        with _METRICS.phase("render"):
+            body = render_issue_body(template, spec, constraints)
+        desired_labels = desired_labels_for_issue(spec, not unresolved[plan_id])
+        digest = spec_digest(spec.title, body, desired_labels, unresolved[plan_id])
+        change = plan_issue_change(
+            spec,
+            body,
+            desired_labels,
+            unresolved[plan_id],
+            digest,
+            snapshot.issues.get(plan_id),
+            closed_trigger_issue_number,
+            closed_trigger_plan_id,
+        )
+        changes.append(change)
+
+    repo_labels = snapshot.labels or {}
+    referenced = {label.lower() for change in changes for label in change.new_labels}
+    return {
+        "version": CHANGE_PLAN_VERSION,
+        "repo": snapshot.repo,
+        "repository_id": snapshot.repository_id,
+        "fingerprint": inputs_fingerprint(snapshot.repo, template, constraints),
+        "label_styles": label_style_updates(repo_labels),
+        # Only labels the changes need; anything missing here is created on apply.
+        "labels": {name: label for name, label in repo_labels.items() if name in referenced},
+        "changes": [asdict(change) for change in changes],
+    }
+
+
+def describe_change(change: IssueChange) -> str:
+    if change.action == "create":
+        msg = f"Create issue for Plan-ID {change.plan_id}"
+    elif change.action == "update":
+        msg_prefix = "Reopen and update" if change.reopen else "Update"
+        msg = f"{msg_prefix} issue #{change.number} for Plan-ID {change.plan_id}"
+    elif change.action == "reopen":
+        msg = f"Reopen issue #{change.number} for Plan-ID {change.plan_id}"
+    elif change.action == "keep-closed":
+        msg = f"Keep closed issue #{change.number} for Plan-ID {change.plan_id}"
+    else:
+        msg = f"Unchanged issue #{change.number} for Plan-ID {change.plan_id}"
+    if change.unresolved:
+        msg += f" (blocked by: {', '.join(change.unresolved)})"
+    return msg
+
+
+def summarize_change_plan(change_plan: dict[str, Any]) -> list[str]:
+    changes = [IssueChange(**item) for item in change_plan["changes"]]
+    lines = [describe_change(change) for change in changes]
+    actions = [change.action for change in changes]
+    lines.append(
+        f"Planned: create={actions.count('create')} update={actions.count('update')} "
+        f"reopen={actions.count('reopen')} unchanged={actions.count('noop') + actions.count('keep-closed')} "
+        f"label_styles={len(change_plan['label_styles'])}"
+    )
+    for line in lines:
+        print(line)
+    return lines
+
+
+def load_change_plan(path: Path) -> dict[str, Any]:
+    change_plan = read_json_file(path, CHANGE_PLAN_VERSION, "change plan")
+    if not isinstance(change_plan.get("changes"), list):
+        raise RelayError(f"Change plan {path} has no change list")
+    return change_plan
+
+
+def apply_change_plan(
+    repo: str,
+    token: str,
+    api_base: str,
+    change_plan: dict[str, Any],
+    backend: str = "rest",
+    concurrency: int = 1,
+    manifest: SyncManifest | None = None,
+) -> list[str]:
+    """Execute a plan from build_change_plan; no lookups are repeated."""
+    changes = [IssueChange(**item) for item in change_plan["changes"]]
+    repo_labels: dict[str, dict[str, Any]] = dict(change_plan.get("labels") or {})
+    with _METRICS.phase("labels"):
+        apply_label_style_updates(repo, token, api_base, repo_labels, list(change_plan.get("label_styles") or []))
+
+    # Writes an interrupted earlier apply already made are not repeated.
+    resumed: dict[str, SyncOutcome] = {}
+    for change in changes:
+        number = manifest.completed(change.plan_id, change.digest) if manifest is not None else None
+        if change.action in WRITE_ACTIONS and number is not None:
+            msg = f"Already applied issue #{number} for Plan-ID {change.plan_id} (journal)"
             print(msg)
-            result_lines.append(msg)
+            resumed[change.plan_id] = SyncOutcome("unchanged", msg, number, change.digest)
+
+    with _METRICS.phase("write"):
+        if backend == "graphql":
+            if not change_plan.get("repository_id"):
+                raise RelayError("Change plan has no repository ID; plan it again with --backend graphql")
+            writes = [change for change in changes if change.action in WRITE_ACTIONS and change.plan_id not in resumed]
+            applied = apply_graphql_changes(
+                repo, token, api_base, change_plan["repository_id"], writes, {}, repo_labels, manifest
+            )
+            applied.update(resumed)
+            outcomes = [applied.get(change.plan_id) or change_outcome(change, int(change.number or 0)) for change in changes]
+        else:
 
-        if index < len(issue_specs) - 1:
-            print(f"Sleeping {ISSUE_SYNC_SLEEP_SECONDS} seconds before next issue sync...")
-            time.sleep(ISSUE_SYNC_SLEEP_SECONDS)
+            def apply_one(change: IssueChange) -> SyncOutcome:
+                if change.plan_id in resumed:
+                    return resumed[change.plan_id]
+                result = apply_issue_change(repo, token, api_base, change, None, repo_labels)
+                if manifest is not None and result.digest and result.number is not None:
+                    manifest.record(change.plan_id, result.digest, result.number)
+                if change.action in WRITE_ACTIONS and ISSUE_SYNC_SLEEP_SECONDS > 0:
+                    _METRICS.add_sleep("issue_sync", ISSUE_SYNC_SLEEP_SECONDS)
+                    time.sleep(ISSUE_SYNC_SLEEP_SECONDS)
+                return result
+
+            if concurrency <= 1:
+                outcomes = [apply_one(change) for change in changes]
+            else:
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    outcomes = list(pool.map(apply_one, changes))
 
-    return result_lines
+    if manifest is not None:
+        for change, outcome in zip(changes, outcomes):
+            if outcome.digest and outcome.number is not None:
+                manifest.record(change.plan_id, outcome.digest, outcome.number)
+    return summarize_outcomes(outcomes)
 
 
 def main() -> int:
     args = parse_args()
+    configure_response_cache(args.cache_dir)
+    try:
+        if args.profile:
+            return profile_run(args)
+        return run(args)
+    finally:
+        save_response_cache()
+        _HTTP_POOL.close()
+        if args.metrics_file:
+            _METRICS.save(args.metrics_file)
+
+
+def profile_run(args: argparse.Namespace) -> int:
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run, args)
+    finally:
+        profiler.dump_stats(args.profile)
+        print(f"Profile written to {args.profile}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+
+
+def run(args: argparse.Namespace) -> int:
+    if args.apply:
+        return run_apply(args)
+    if args.merge_results:
+        lines, details = merge_results(args.merge_results)
+        for line in lines:
+            print(line)
+        write_summary(lines, details)
+        return 0
+
     plan_dir = Path(args.plan_dir)
     template_path = Path(args.template)
 
     if not plan_dir.exists():
         raise RelayError(f"Plan directory not found: {plan_dir}")
 
-    issue_specs = load_issue_specs(plan_dir)
+    with _METRICS.phase("load"):
+        issue_specs = load_issue_specs(plan_dir, args.cache_dir)
     if not issue_specs:
         print("No plan issue files found under .muselucid/plan/issues/*.yaml")
-        write_summary(["No issue files found."])
+        report_results(args, ["No issue files found."])
         return 0
 
-    constraints = load_constraints(plan_dir)
-    template = load_template(template_path)
+    with _METRICS.phase("dependencies"):
+        graph = build_dependency_graph(issue_specs)
+    warnings = dependency_warnings(graph)
+    for warning in warnings:
+        print(f"Warning: {warning}")
+
+    with _METRICS.phase("load"):
+        constraints = load_constraints(plan_dir)
+        template = load_template(template_path)
+        # Fail on unknown placeholders before any API call.
+        compile_template(template, tuple(constraints))
     closed_trigger_issue_number, closed_trigger_plan_id = load_closed_issue_trigger()
 
+    all_plan_ids = list(graph.order)
+    lookup_ids = graph.referenced_ids()
+    targeted = bool(closed_trigger_plan_id) and not args.full_sync
+    if targeted:
+        # A closed issue can only change the blocked/ready state of the specs behind it.
+        affected = set(graph.transitive_dependents(closed_trigger_plan_id))
+        if not affected:
+            msg = f"No plan specs depend on closed Plan-ID {closed_trigger_plan_id}; nothing to sync."
+            print(msg)
+            report_results(args, warnings + [msg])
+            return 0
+        issue_specs = [spec for spec in issue_specs if spec.issue_id in affected]
+        lookup_ids = graph.upstream_ids([spec.issue_id for spec in issue_specs])
+        msg = f"Closed Plan-ID {closed_trigger_plan_id}: re-syncing {len(issue_specs)} dependent spec(s)."
+        print(msg)
+        warnings.append(msg)
+
+    if args.shard:
+        shard_index, shard_count = args.shard
+        # Dependency state still comes from the whole graph, so shards agree on blocked/ready.
+        issue_specs = [spec for spec in issue_specs if shard_of(spec.issue_id, shard_count) == shard_index]
+        lookup_ids = graph.upstream_ids([spec.issue_id for spec in issue_specs])
+        msg = f"Shard {shard_index}/{shard_count}: {len(issue_specs)} of {len(all_plan_ids)} spec(s)."
+        print(msg)
+        warnings.append(msg)
+        if not issue_specs:
+            report_results(args, warnings)
+            return 0
+
+    snapshot = IssueSnapshot.load(Path(args.snapshot)) if args.snapshot else None
+    if snapshot is not None:
+        if args.repo and snapshot.repo and args.repo != snapshot.repo:
+            raise RelayError(f"Snapshot {args.snapshot} is for {snapshot.repo}, not {args.repo}")
+        args.repo = args.repo or snapshot.repo
+
+    # Previews and plans from a snapshot never touch the API.
+    offline_plan = bool(args.plan_out) and snapshot is not None
+    if not args.dry_run and not offline_plan:
+        if not args.repo:
+            raise RelayError("GITHUB_REPOSITORY is required")
+        if not args.token:
+            raise RelayError("GITHUB_TOKEN is required")
+
+    with _METRICS.phase("snapshot"):
+        if snapshot is not None:
+            pass
+        elif args.dry_run and not args.token:
+            print("No token: previewing without issue lookups.")
+            snapshot = IssueSnapshot(args.repo, "", {})
+        elif args.backend == "graphql":
+            if not args.repo:
+                raise RelayError("GITHUB_REPOSITORY is required")
+            snapshot = IssueSnapshot(args.repo, *fetch_graphql_snapshot(args.repo, args.token, args.api_base))
+        elif args.lookup == "index" and args.repo:
+            snapshot = IssueSnapshot(args.repo, "", build_plan_id_index(args.repo, args.token, args.api_base))
+        elif args.lookup == "search" and args.repo:
+            issue_index = build_search_index(args.repo, lookup_ids, args.token, args.api_base)
+            snapshot = IssueSnapshot(args.repo, "", issue_index)
+        else:
+            snapshot = IssueSnapshot(args.repo, "", {})
+    repository_id = snapshot.repository_id
+    issue_index = snapshot.issues
+
     if args.dry_run:
         lines = sync_issues(
             repo=args.repo,
@@ -583,27 +2594,121 @@ def main() -> int:
             dry_run=True,
             closed_trigger_issue_number=closed_trigger_issue_number,
             closed_trigger_plan_id=closed_trigger_plan_id,
+            issue_index=issue_index,
+            graph=graph,
         )
-        write_summary(lines)
+        report_results(args, warnings + lines)
         return 0
 
-    if not args.repo:
+    with _METRICS.phase("labels"):
+        if snapshot.labels is None and offline_plan:
+            # Applying a plan creates whatever labels are missing, so planning against none is safe.
+            print(f"Snapshot {args.snapshot} has no labels; planning as if the repository had none.")
+            snapshot.labels = {}
+        elif snapshot.labels is None:
+            snapshot.labels = fetch_repo_labels(args.repo, args.token, args.api_base)
+    if args.write_snapshot:
+        snapshot.save(Path(args.write_snapshot))
+        print(f"Snapshot written to {args.write_snapshot}")
+
+    if args.plan_out:
+        change_plan = build_change_plan(
+            snapshot,
+            issue_specs,
+            template,
+            constraints,
+            graph,
+            closed_trigger_issue_number,
+            closed_trigger_plan_id,
+        )
+        write_json_file(Path(args.plan_out), change_plan)
+        print(f"Change plan written to {args.plan_out}")
+        report_results(args, warnings + summarize_change_plan(change_plan))
+        return 0
+
+    manifest = None
+    if args.cache_dir:
+        manifest = SyncManifest(
+            manifest_path(args.cache_dir, args.shard),
+            inputs_fingerprint(args.repo, template, constraints),
+        )
+        if not args.full_sync:
+            manifest.load()
+
+    repo_labels = snapshot.labels
+    # Creating labels is safe from every shard (422 means another shard won); restyling is left to shard 0.
+    if not args.shard or args.shard[0] == 0:
+        with _METRICS.phase("labels"):
+            reconcile_label_styles(args.repo, args.token, args.api_base, repo_labels)
+
+    with _METRICS.phase("write"):
+        if args.backend == "graphql":
+            lines = sync_issues_graphql(
+                repo=args.repo,
+                token=args.token,
+                api_base=args.api_base,
+                repository_id=repository_id,
+                issue_specs=issue_specs,
+                template=template,
+                constraints=constraints,
+                issue_index=issue_index,
+                repo_labels=repo_labels,
+                closed_trigger_issue_number=closed_trigger_issue_number,
+                closed_trigger_plan_id=closed_trigger_plan_id,
+                manifest=manifest,
+                graph=graph,
+            )
+        else:
+            lines = sync_issues(
+                repo=args.repo,
+                token=args.token,
+                api_base=args.api_base,
+                issue_specs=issue_specs,
+                template=template,
+                constraints=constraints,
+                dry_run=False,
+                closed_trigger_issue_number=closed_trigger_issue_number,
+                closed_trigger_plan_id=closed_trigger_plan_id,
+                issue_index=issue_index,
+                concurrency=args.concurrency,
+                manifest=manifest,
+                repo_labels=repo_labels,
+                graph=graph,
+            )
+    if manifest is not None:
+        if targeted:
+            manifest.carry_over(all_plan_ids)
+        manifest.save()
+    report_results(args, warnings + lines)
+    return 0
+
+
+def run_apply(args: argparse.Namespace) -> int:
+    change_plan = load_change_plan(Path(args.apply))
+    if args.repo and change_plan["repo"] and args.repo != change_plan["repo"]:
+        raise RelayError(f"Change plan {args.apply} is for {change_plan['repo']}, not {args.repo}")
+    repo = args.repo or str(change_plan["repo"])
+    if not repo:
         raise RelayError("GITHUB_REPOSITORY is required")
     if not args.token:
         raise RelayError("GITHUB_TOKEN is required")
 
-    lines = sync_issues(
-        repo=args.repo,
-        token=args.token,
-        api_base=args.api_base,
-        issue_specs=issue_specs,
-        template=template,
-        constraints=constraints,
-        dry_run=False,
-        closed_trigger_issue_number=closed_trigger_issue_number,
-        closed_trigger_plan_id=closed_trigger_plan_id,
+    manifest = None
+    if args.cache_dir:
+        manifest = SyncManifest(manifest_path(args.cache_dir, args.shard), str(change_plan.get("fingerprint", "")))
+        manifest.load()
+    lines = apply_change_plan(
+        repo,
+        args.token,
+        args.api_base,
+        change_plan,
+        backend=args.backend,
+        concurrency=args.concurrency,
+        manifest=manifest,
     )
-    write_summary(lines)
+    if manifest is not None:
+        manifest.save()
+    report_results(args, lines)
     return 0
 
 
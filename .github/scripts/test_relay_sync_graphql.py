@@ -0,0 +1,277 @@
+"""Replay tests for the GraphQL backend of relay_sync.py.
+
+Recorded GraphQL responses are served in order in place of api_request, so
+no network access or token is needed:
+
+    python -m pytest .github/scripts/test_relay_sync_graphql.py
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import relay_sync  # noqa: E402
+
+REPO = "octo/plans"
+API_BASE = "https://api.github.com"
+
+
+def issue_node(number: int, plan_id: str, state: str = "OPEN", labels: tuple[str, ...] = ()) -> dict[str, Any]:
+    return {
+        "id": f"I_{number}",
+        "number": number,
+        "title": f"Issue {number}",
+        "body": f"Plan-ID: {plan_id}\n\nBody of {plan_id}",
+        "state": state,
+        "updatedAt": "2026-01-01T00:00:00Z",
+        "labels": {"nodes": [{"name": name} for name in labels]},
+    }
+
+
+def page(nodes: list[dict[str, Any]], end_cursor: str | None, has_next: bool) -> dict[str, Any]:
+    return {"pageInfo": {"hasNextPage": has_next, "endCursor": end_cursor}, "nodes": nodes}
+
+
+def change(plan_id: str, action: str, **fields: Any) -> relay_sync.IssueChange:
+    return relay_sync.IssueChange(
+        plan_id=plan_id,
+        action=action,
+        title=f"Title {plan_id}",
+        body=f"Plan-ID: {plan_id}\n\nNew body",
+        labels=["plan"],
+        new_labels=[],
+        unresolved=[],
+        digest=f"digest-{plan_id}",
+        **fields,
+    )
+
+
+class Replay:
+    """Stand-in for api_request that returns recorded responses in order."""
+
+    def __init__(self, responses: list[dict[str, Any]]) -> None:
+        self.responses = list(responses)
+        self.calls: list[dict[str, Any]] = []
+
+    def __call__(
+        self,
+        method: str,
+        api_base: str,
+        path: str,
+        token: str,
+        payload: dict[str, Any] | None = None,
+        writes: int | None = None,
+    ) -> Any:
+        if (method, path) != ("POST", "/graphql"):
+            raise AssertionError(f"unexpected request {method} {path}")
+        if not self.responses:
+            raise AssertionError("no recorded response left")
+        # Copied both ways like a real round trip: the snapshot loop reuses its variables dict.
+        self.calls.append({**json.loads(json.dumps(payload)), "writes": writes})
+        return json.loads(json.dumps(self.responses.pop(0)))
+
+
+class GraphQLReplayTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.manifest = relay_sync.SyncManifest(Path(self.tmp.name) / "manifest.json", "fingerprint")
+        # Every label already exists, so label_node_ids never falls back to REST.
+        self.repo_labels = {"plan": {"node_id": "LA_plan", "name": "plan", "color": "ededed", "description": ""}}
+
+    def replay(self, responses: list[dict[str, Any]]) -> Replay:
+        replay = Replay(responses)
+        patcher = mock.patch.object(relay_sync, "api_request", replay)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return replay
+
+    def test_snapshot_follows_issue_and_label_pages(self) -> None:
+        replay = self.replay(
+            [
+                {
+                    "data": {
+                        "repository": {
+                            "id": "R_1",
+                            "issues": page([issue_node(1, "PLAN-1"), issue_node(2, "PLAN-2", "CLOSED")], "i1", True),
+                            "labels": page([{"id": "LA_plan", "name": "Plan", "color": "ededed"}], "l1", True),
+                        }
+                    }
+                },
+                {
+                    "data": {
+                        "repository": {
+                            "id": "R_1",
+                            "issues": page([issue_node(3, "PLAN-3", labels=("plan",))], "i2", False),
+                            "labels": page([{"id": "LA_bug", "name": "bug", "color": "d73a4a"}], "l2", False),
+                        }
+                    }
+                },
+            ]
+        )
+
+        repository_id, index, labels = relay_sync.fetch_graphql_snapshot(REPO, "token", API_BASE)
+
+        self.assertEqual(repository_id, "R_1")
+        self.assertEqual(sorted(index), ["PLAN-1", "PLAN-2", "PLAN-3"])
+        self.assertEqual(index["PLAN-2"]["state"], "closed")
+        self.assertEqual(index["PLAN-3"]["labels"], [{"name": "plan"}])
+        self.assertEqual(labels["plan"]["node_id"], "LA_plan")
+        self.assertEqual(labels["bug"]["name"], "bug")
+        self.assertEqual(len(replay.calls), 2)
+        first, second = (call["variables"] for call in replay.calls)
+        self.assertEqual((first["owner"], first["name"]), ("octo", "plans"))
+        self.assertEqual((first["issuesAfter"], first["labelsAfter"]), (None, None))
+        self.assertEqual((second["issuesAfter"], second["labelsAfter"]), ("i1", "l1"))
+
+    def test_snapshot_stops_asking_for_finished_connections(self) -> None:
+        replay = self.replay(
+            [
+                {
+                    "data": {
+                        "repository": {
+                            "id": "R_1",
+                            "issues": page([issue_node(1, "PLAN-1")], "i1", True),
+                            "labels": page([], None, False),
+                        }
+                    }
+                },
+                {"data": {"repository": {"id": "R_1", "issues": page([issue_node(2, "PLAN-2")], "i2", False)}}},
+            ]
+        )
+
+        _, index, labels = relay_sync.fetch_graphql_snapshot(REPO, "token", API_BASE)
+
+        self.assertEqual(sorted(index), ["PLAN-1", "PLAN-2"])
+        self.assertEqual(labels, {})
+        self.assertEqual(replay.calls[1]["variables"]["withLabels"], False)
+        self.assertEqual(replay.calls[1]["variables"]["issuesAfter"], "i1")
+
+    def test_apply_batches_create_update_and_reopen(self) -> None:
+        changes = [
+            change("PLAN-1", "create"),
+            change("PLAN-2", "update", number=2, node_id="I_2"),
+            change("PLAN-3", "reopen", number=3, node_id="I_3", reopen=True),
+        ]
+        replay = self.replay(
+            [
+                {"data": {"m0": {"issue": issue_node(10, "PLAN-1")}, "m1": {"issue": issue_node(2, "PLAN-2")}}},
+                {"data": {"m0": {"issue": issue_node(3, "PLAN-3")}}},
+            ]
+        )
+        index: dict[str, dict[str, Any]] = {}
+
+        with mock.patch.object(relay_sync, "GRAPHQL_BATCH_SIZE", 2):
+            outcomes = relay_sync.apply_graphql_changes(
+                REPO, "token", API_BASE, "R_1", changes, index, self.repo_labels, self.manifest
+            )
+
+        self.assertEqual([call["writes"] for call in replay.calls], [2, 1])
+        first, second = replay.calls
+        self.assertIn("m0: createIssue(input: $input0)", first["query"])
+        self.assertIn("m1: updateIssue(input: $input1)", first["query"])
+        self.assertEqual(first["variables"]["input0"]["repositoryId"], "R_1")
+        self.assertEqual(first["variables"]["input0"]["labelIds"], ["LA_plan"])
+        self.assertEqual(first["variables"]["input1"]["id"], "I_2")
+        # A reopen only flips the state; title, body and labels are left alone.
+        self.assertEqual(second["variables"]["input0"], {"id": "I_3", "state": "OPEN"})
+
+        self.assertEqual(
+            {plan_id: outcome.status for plan_id, outcome in outcomes.items()},
+            {"PLAN-1": "created", "PLAN-2": "updated", "PLAN-3": "updated"},
+        )
+        self.assertEqual(index["PLAN-1"]["number"], 10)
+        self.assertEqual(
+            self.manifest.entries,
+            {
+                "PLAN-1": {"hash": "digest-PLAN-1", "number": 10},
+                "PLAN-2": {"hash": "digest-PLAN-2", "number": 2},
+                "PLAN-3": {"hash": "digest-PLAN-3", "number": 3},
+            },
+        )
+
+    def test_partial_failure_records_only_successful_mutations(self) -> None:
+        changes = [
+            change("PLAN-1", "create"),
+            change("PLAN-2", "update", number=2, node_id="I_2"),
+            change("PLAN-3", "create"),
+        ]
+        self.replay(
+            [
+                {
+                    "data": {"m0": {"issue": issue_node(10, "PLAN-1")}, "m1": None, "m2": {"issue": issue_node(11, "PLAN-3")}},
+                    "errors": [{"type": "NOT_FOUND", "path": ["m1"], "message": "Could not resolve to a node with the global id of 'I_2'"}],
+                }
+            ]
+        )
+        index: dict[str, dict[str, Any]] = {}
+
+        with self.assertRaisesRegex(relay_sync.RelayError, r"Plan-IDs: PLAN-2$"):
+            relay_sync.apply_graphql_changes(REPO, "token", API_BASE, "R_1", changes, index, self.repo_labels, self.manifest)
+
+        self.assertEqual(sorted(self.manifest.entries), ["PLAN-1", "PLAN-3"])
+        self.assertEqual(sorted(index), ["PLAN-1", "PLAN-3"])
+        # The journal lets the next run skip the writes that went through.
+        journal = self.manifest.journal_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(line)["plan_id"] for line in journal[1:]], ["PLAN-1", "PLAN-3"])
+
+    def test_document_error_records_nothing(self) -> None:
+        self.replay([{"errors": [{"message": "Parse error on \"}\" (RCURLY)", "locations": [{"line": 3, "column": 1}]}]}])
+
+        with self.assertRaises(relay_sync.GitHubApiError):
+            relay_sync.apply_graphql_changes(
+                REPO, "token", API_BASE, "R_1", [change("PLAN-1", "create")], {}, self.repo_labels, self.manifest
+            )
+
+        self.assertEqual(self.manifest.entries, {})
+
+    def test_rate_limited_snapshot_is_sent_again(self) -> None:
+        replay = self.replay(
+            [
+                {"data": None, "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]},
+                {"data": {"repository": {"id": "R_1", "issues": page([], None, False), "labels": page([], None, False)}}},
+            ]
+        )
+
+        with mock.patch.object(relay_sync.time, "sleep"):
+            repository_id, _, _ = relay_sync.fetch_graphql_snapshot(REPO, "token", API_BASE)
+
+        self.assertEqual(repository_id, "R_1")
+        self.assertEqual(len(replay.calls), 2)
+
+    def test_rate_limited_mutation_is_resent_alone(self) -> None:
+        changes = [change("PLAN-1", "create"), change("PLAN-2", "update", number=2, node_id="I_2")]
+        replay = self.replay(
+            [
+                {
+                    "data": {"m0": {"issue": issue_node(10, "PLAN-1")}, "m1": None},
+                    "errors": [{"type": "RATE_LIMITED", "path": ["m1"], "message": "API rate limit exceeded"}],
+                },
+                {"data": {"m0": {"issue": issue_node(2, "PLAN-2")}}},
+            ]
+        )
+
+        with mock.patch.object(relay_sync.time, "sleep"):
+            outcomes = relay_sync.apply_graphql_changes(
+                REPO, "token", API_BASE, "R_1", changes, {}, self.repo_labels, self.manifest
+            )
+
+        # PLAN-1 was created by the first document; sending it again would open a duplicate issue.
+        retried = replay.calls[1]
+        self.assertNotIn("createIssue", retried["query"])
+        self.assertEqual(retried["variables"]["input0"]["id"], "I_2")
+        self.assertEqual(retried["writes"], 1)
+        self.assertEqual(sorted(outcomes), ["PLAN-1", "PLAN-2"])
+        self.assertEqual(sorted(self.manifest.entries), ["PLAN-1", "PLAN-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,955 @@
+#!/usr/bin/env python3
+"""Fetch the latest headlines from RSS/Atom feeds.
+
+``show_latest_headline.sh`` is a thin wrapper around :func:`main`. Services
+that need a headline can put ``scripts/`` on ``sys.path`` and call
+:func:`fetch_headlines`, :func:`parse_headlines` or :func:`resolve_many`
+in-process instead of spawning the CLI. Failures raise :class:`HeadlineError`
+subclasses whose ``exit_code`` matches the CLI exit codes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import random
+import signal
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Iterator
+from urllib.parse import unquote, urljoin, urlsplit
+
+if TYPE_CHECKING:
+    import http.client
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms run without the cache lock
+    fcntl = None
+
+DEFAULT_FEED_URL = "https://feeds.bbci.co.uk/news/rss.xml"
+CONNECT_TIMEOUT_SECONDS = 5
+MAX_TIME_SECONDS = 15
+RETRIES = 2
+RETRY_DELAY_SECONDS = 1
+# Statuses curl --retry treats as transient.
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+MAX_REDIRECTS = 5
+LOCK_TIMEOUT_SECONDS = 30
+CHUNK_SIZE = 64 * 1024
+BATCH_WORKERS = 16
+WATCH_SEEN_LIMIT = 1000
+CACHE_VERSION = 1
+USER_AGENT = "show_latest_headline"
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+# Item tag -> (title tag, identity tags in preference order, date tags).
+ITEM_FIELDS = {
+    "item": ("title", ("guid", "link"), ("pubDate",)),
+    ATOM + "entry": (ATOM + "title", (ATOM + "id", ATOM + "link"), (ATOM + "updated", ATOM + "published")),
+}
+
+
+class HeadlineError(Exception):
+    """Base error; ``exit_code`` is the CLI exit status for the failure."""
+
+    exit_code = 1
+    default_message = "failed to get headline"
+
+    def __init__(self, message: str | None = None) -> None:
+        super().__init__(message or self.default_message)
+
+
+class FetchError(HeadlineError):
+    exit_code = 10
+    default_message = "failed to fetch feed (network or timeout error)"
+
+
+class UnsupportedURLError(FetchError):
+    """A feed URL, or a redirect target, that is not http(s); never retried."""
+
+
+class HTTPStatusError(HeadlineError):
+    exit_code = 11
+    default_message = "failed to fetch feed (HTTP error)"
+
+    def __init__(self, status: int) -> None:
+        super().__init__(f"failed to fetch feed (HTTP error {status})")
+        self.status = status
+
+
+class ParseError(HeadlineError):
+    exit_code = 20
+    default_message = "failed to parse feed response"
+
+
+class NoHeadlineError(HeadlineError):
+    exit_code = 21
+    default_message = "no headline found in feed"
+
+
+@dataclass
+class Headline:
+    title: str
+    guid: str
+    published: datetime | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "title": self.title,
+            "guid": self.guid,
+            "published": self.published.isoformat() if self.published else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Headline:
+        published = data.get("published")
+        return cls(
+            title=data["title"],
+            guid=data.get("guid") or data["title"],
+            published=datetime.fromisoformat(published) if published else None,
+        )
+
+
+@dataclass
+class FeedResult:
+    """Outcome of one source in :func:`resolve_many`."""
+
+    source: str
+    headlines: list[Headline] = field(default_factory=list)
+    error: HeadlineError | None = None
+
+    @property
+    def exit_code(self) -> int:
+        return self.error.exit_code if self.error else 0
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"source": self.source, "exit": self.exit_code}
+        if self.error:
+            data["error"] = str(self.error)
+        else:
+            data["headlines"] = [headline.to_dict() for headline in self.headlines]
+        return data
+
+
+def _published_at(item: ET.Element, tags: tuple[str, ...]) -> datetime | None:
+    for tag in tags:
+        text = (item.findtext(tag) or "").strip()
+        if not text:
+            continue
+        try:
+            if tag == "pubDate":
+                return parsedate_to_datetime(text).astimezone(timezone.utc)
+            return datetime.fromisoformat(text.replace("Z", "+00:00")).astimezone(timezone.utc)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _item_headline(item: ET.Element) -> Headline | None:
+    title_tag, id_tags, date_tags = ITEM_FIELDS[item.tag]
+    title = " ".join((item.findtext(title_tag) or "").split())
+    if not title:
+        return None
+    guid = title
+    for tag in id_tags:
+        child = item.find(tag)
+        # Atom links carry the URL in href rather than in the element text.
+        value = "" if child is None else (child.text or child.get("href") or "").strip()
+        if value:
+            guid = value
+            break
+    return Headline(title=title, guid=guid, published=_published_at(item, date_tags))
+
+
+def parse_headlines(source: bytes | BinaryIO, limit: int | None = 1) -> list[Headline]:
+    """Return the first ``limit`` headlines (all when ``None``) in feed order.
+
+    ``source`` is the feed as bytes or a binary stream. The stream is
+    pull-parsed in chunks and reading stops once enough headlines are found,
+    so the rest of a long feed is never read, parsed or held in memory.
+    """
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+    # read1 returns whatever has arrived instead of blocking for a full chunk, so a
+    # slow response is parsed as it trickles in.
+    read = getattr(stream, "read1", stream.read)
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: list[ET.Element] = []
+    headlines: list[Headline] = []
+    try:
+        while True:
+            chunk = read(CHUNK_SIZE)
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+            for event, elem in parser.read_events():
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if elem.tag in ITEM_FIELDS:
+                    headline = _item_headline(elem)
+                    if headline:
+                        headlines.append(headline)
+                        if limit and len(headlines) >= limit:
+                            return headlines
+                if stack and stack[-1].tag not in ITEM_FIELDS:
+                    # Finished subtrees are dropped so memory stays flat on long feeds;
+                    # item children are kept until the item itself ends.
+                    stack[-1].remove(elem)
+            if not chunk:
+                break
+    except (ET.ParseError, EOFError, OSError, ValueError):
+        # gzip and decoding failures surface as OSError/EOFError/ValueError.
+        raise ParseError() from None
+    if not headlines:
+        raise NoHeadlineError()
+    return headlines
+
+
+def parse_headline(source: bytes | BinaryIO) -> str:
+    """Return the title of the first headline in a feed."""
+    return parse_headlines(source, 1)[0].title
+
+
+class _BodyStream(io.RawIOBase):
+    """Response body that enforces the overall deadline and returns its connection when drained."""
+
+    def __init__(
+        self,
+        client: FeedClient,
+        key: tuple[str, str],
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        deadline: float,
+    ) -> None:
+        self._client = client
+        self._key = key
+        self._connection = connection
+        self._response = response
+        self._deadline = deadline
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        import http.client
+
+        if time.monotonic() > self._deadline:
+            raise FetchError()
+        try:
+            data = self._response.read1(len(buffer))
+            if not data:
+                # read1 does not mark a fully read response closed; read() does, which frees the connection.
+                self._response.read()
+        except (OSError, http.client.HTTPException):
+            raise FetchError() from None
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            # Only a fully read response leaves the connection reusable.
+            if self._response.isclosed():
+                self._client._release(self._key, self._connection)
+            else:
+                self._connection.close()
+        super().close()
+
+
+@dataclass
+class FeedResponse:
+    """A fetched feed. ``stream`` is the decoded body, or ``None`` for 304 Not Modified."""
+
+    url: str
+    status: int
+    stream: BinaryIO | None = None
+    etag: str = ""
+    last_modified: str = ""
+    # True when every redirect on the way was permanent, so callers may adopt ``url``.
+    moved: bool = False
+    _body: BinaryIO | None = None
+
+    def close(self) -> None:
+        for handle in (self.stream, self._body):
+            if handle is not None:
+                handle.close()
+
+    def __enter__(self) -> FeedResponse:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class FeedClient:
+    """Fetch feeds over kept-alive HTTP(S) connections, pooled per host.
+
+    Mirrors the curl settings the CLI used: a connect timeout, an overall
+    deadline per fetch, redirects, and retries with a fixed delay on network
+    errors and transient HTTP statuses. Safe to share between threads.
+
+    http.client (with ssl and the email parser) is imported on first use:
+    it is most of the interpreter start-up cost, and cache hits and local
+    files never need it.
+    """
+
+    def __init__(
+        self,
+        timeout: float = MAX_TIME_SECONDS,
+        retries: int = RETRIES,
+        retry_delay: float = RETRY_DELAY_SECONDS,
+    ) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._proxies: dict[str, str] | None = None
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def fetch(self, url: str, etag: str = "", last_modified: str = "") -> FeedResponse:
+        """Fetch ``url``, sending the validators as a conditional request when given."""
+        for attempt in range(self.retries + 1):
+            try:
+                return self._fetch_once(url, etag, last_modified)
+            except (FetchError, HTTPStatusError) as error:
+                if isinstance(error, HTTPStatusError):
+                    retryable = error.status in RETRYABLE_STATUSES
+                else:
+                    retryable = not isinstance(error, UnsupportedURLError)
+                if attempt == self.retries or not retryable:
+                    raise
+            time.sleep(self.retry_delay)
+        raise AssertionError("unreachable")
+
+    def _fetch_once(self, url: str, etag: str, last_modified: str) -> FeedResponse:
+        deadline = time.monotonic() + self.timeout
+        moved = True
+        for hop in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            # Only http(s) is fetched remotely; a redirect must never reach a local file.
+            if parts.scheme not in ("http", "https"):
+                where = "redirect to unsupported URL scheme" if hop else "unsupported URL scheme"
+                raise UnsupportedURLError(f"failed to fetch feed ({where}: {parts.scheme or url})")
+            headers = {"Accept-Encoding": "gzip", "User-Agent": USER_AGENT}
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+            key, connection, response = self._send(parts, headers, deadline)
+            status = response.status
+            location = response.getheader("Location")
+            if status in (301, 302, 303, 307, 308) and location or status == 304 or status >= 400:
+                self._drain(key, connection, response)
+                if status == 304:
+                    return FeedResponse(url=url, status=304, etag=etag, last_modified=last_modified, moved=moved)
+                if status >= 400:
+                    raise HTTPStatusError(status)
+                url = urljoin(url, location)
+                moved = moved and status in (301, 308)
+                continue
+            body: BinaryIO = io.BufferedReader(_BodyStream(self, key, connection, response, deadline), CHUNK_SIZE)
+            stream = body
+            if (response.getheader("Content-Encoding") or "").lower() == "gzip":
+                stream = gzip.GzipFile(fileobj=body)
+            return FeedResponse(
+                url=url,
+                status=status,
+                stream=stream,
+                etag=response.getheader("ETag") or "",
+                last_modified=response.getheader("Last-Modified") or "",
+                moved=moved,
+                _body=body,
+            )
+        raise FetchError("failed to fetch feed (too many redirects)")
+
+    def _send(
+        self, parts: Any, headers: dict[str, str], deadline: float
+    ) -> tuple[tuple[str, str], http.client.HTTPConnection, http.client.HTTPResponse]:
+        import http.client
+
+        key = (parts.scheme, parts.netloc)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        proxy = self._proxy(parts)
+        if proxy and parts.scheme == "http":
+            # Plain HTTP goes through the proxy with an absolute request target.
+            target = parts._replace(fragment="").geturl()
+        # A kept-alive socket the server has since closed fails on first use; retry once on a new one.
+        for attempt in range(2):
+            connection, reused = self._acquire(key, parts, proxy)
+            try:
+                if connection.sock is None:
+                    connection.connect()
+                connection.sock.settimeout(max(0.1, deadline - time.monotonic()))
+                connection.request("GET", target, headers=headers)
+                return key, connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused or attempt:
+                    raise FetchError() from None
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise FetchError() from None
+        raise AssertionError("unreachable")
+
+    def _proxy(self, parts: Any) -> Any:
+        from urllib.request import getproxies, proxy_bypass
+
+        if self._proxies is None:
+            self._proxies = getproxies()
+        proxy = self._proxies.get(parts.scheme)
+        if not proxy or proxy_bypass(parts.hostname or ""):
+            return None
+        return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    def _acquire(
+        self, key: tuple[str, str], parts: Any, proxy: Any
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        import http.client
+
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        host = proxy.netloc if proxy else parts.netloc
+        if parts.scheme == "https":
+            connection: http.client.HTTPConnection = http.client.HTTPSConnection(host, timeout=CONNECT_TIMEOUT_SECONDS)
+            if proxy:
+                connection.set_tunnel(parts.netloc)
+        else:
+            connection = http.client.HTTPConnection(host, timeout=CONNECT_TIMEOUT_SECONDS)
+        return connection, False
+
+    def _release(self, key: tuple[str, str], connection: http.client.HTTPConnection) -> None:
+        if connection.sock is None:
+            return
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def _drain(
+        self, key: tuple[str, str], connection: http.client.HTTPConnection, response: http.client.HTTPResponse
+    ) -> None:
+        import http.client
+
+        try:
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            return
+        self._release(key, connection)
+
+
+def _local_path(source: str) -> Path | None:
+    """Return the path of an explicit ``file://`` source; anything else is fetched as a URL."""
+    parts = urlsplit(source)
+    if parts.scheme == "file":
+        return Path(unquote(parts.path))
+    return None
+
+
+def _open_file(source: str) -> FeedResponse:
+    path = _local_path(source)
+    try:
+        stream = open(path, "rb")  # noqa: SIM115 - closed by FeedResponse
+    except OSError as exc:
+        raise FetchError(f"failed to read feed file ({exc.strerror}): {path}") from None
+    return FeedResponse(url=source, status=200, stream=stream)
+
+
+_DEFAULT_CLIENT: FeedClient | None = None
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def default_client() -> FeedClient:
+    """Return the process-wide client, so in-process callers share warm connections."""
+    global _DEFAULT_CLIENT
+    with _DEFAULT_CLIENT_LOCK:
+        if _DEFAULT_CLIENT is None:
+            _DEFAULT_CLIENT = FeedClient()
+        return _DEFAULT_CLIENT
+
+
+def fetch_feed(url: str, etag: str = "", last_modified: str = "", client: FeedClient | None = None) -> FeedResponse:
+    """Fetch a feed URL (or ``file://`` URL); use the result as a context manager to release it."""
+    if _local_path(url) is not None:
+        return _open_file(url)
+    return (client or default_client()).fetch(url, etag, last_modified)
+
+
+@dataclass
+class CacheEntry:
+    path: Path
+    cache_id: str
+    fetched_at: float = 0.0
+    etag: str = ""
+    last_modified: str = ""
+    headlines: list[Headline] = field(default_factory=list)
+
+    @property
+    def meta_path(self) -> Path:
+        return self.path.with_suffix(".json")
+
+    @classmethod
+    def load(cls, path: Path, cache_id: str) -> CacheEntry:
+        entry = cls(path=path, cache_id=cache_id)
+        try:
+            data = json.loads(entry.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return entry
+        # Hash keys can collide; only trust entries written for this exact source.
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("id") != cache_id:
+            return entry
+        try:
+            entry.fetched_at = float(data.get("fetched_at", 0))
+            entry.etag = str(data.get("etag", ""))
+            entry.last_modified = str(data.get("last_modified", ""))
+            entry.headlines = [Headline.from_dict(item) for item in data.get("headlines", [])]
+        except (KeyError, TypeError, ValueError):
+            return cls(path=path, cache_id=cache_id)
+        return entry
+
+    def fresh(self, ttl: float) -> bool:
+        return bool(self.headlines) and time.time() - self.fetched_at < ttl
+
+    def save(self) -> None:
+        self.fetched_at = time.time()
+        data = {
+            "version": CACHE_VERSION,
+            "id": self.cache_id,
+            "fetched_at": self.fetched_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "headlines": [headline.to_dict() for headline in self.headlines],
+        }
+        tmp_path = self.meta_path.with_name(f"{self.meta_path.name}.{os.getpid()}.{threading.get_ident()}")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.meta_path)
+
+
+class FeedCache:
+    """Feed validators and parsed headlines on disk, keyed by source.
+
+    Entries younger than ``ttl`` seconds are served without any request; older
+    ones are revalidated with ETag/Last-Modified. Concurrent processes
+    resolving the same source queue on a lock file, so only the first fetches.
+    """
+
+    def __init__(self, directory: str | Path, ttl: float) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    @contextmanager
+    def entry(self, cache_id: str) -> Iterator[CacheEntry]:
+        path = self.directory / hashlib.sha256(cache_id.encode("utf-8")).hexdigest()[:32]
+        with open(path.with_suffix(".lock"), "a") as lock_file:
+            _lock(lock_file, LOCK_TIMEOUT_SECONDS)
+            yield CacheEntry.load(path, cache_id)
+
+
+def _lock(handle: Any, timeout: float) -> None:
+    if fcntl is None:
+        return
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                # A stuck holder should not block the CLI forever; fetch without the lock.
+                return
+            time.sleep(0.05)
+
+
+def open_cache(directory: str | None, ttl: float) -> FeedCache | None:
+    """Return a cache in ``directory``, or ``None`` when it is empty or cannot be created."""
+    if not directory:
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return None
+    return FeedCache(directory, ttl)
+
+
+def fetch_headlines(
+    source: str,
+    limit: int = 1,
+    *,
+    client: FeedClient | None = None,
+    cache: FeedCache | None = None,
+) -> list[Headline]:
+    """Fetch a feed URL (or ``file://`` URL) and return its first ``limit`` headlines."""
+    if _local_path(source) is not None:
+        with _open_file(source) as response:
+            return parse_headlines(response.stream, limit)
+    client = client or default_client()
+    if cache is None:
+        with client.fetch(source) as response:
+            return parse_headlines(response.stream, limit)
+
+    cache_id = source if limit == 1 else f"{source}#items={limit}"
+    with cache.entry(cache_id) as entry:
+        if entry.fresh(cache.ttl):
+            return entry.headlines
+        # Validators are only worth sending when there are headlines a 304 can reuse.
+        revalidate = bool(entry.headlines)
+        with client.fetch(
+            source, entry.etag if revalidate else "", entry.last_modified if revalidate else ""
+        ) as response:
+            if response.status == 304:
+                # Unchanged upstream: reuse the cached headlines and restart the TTL.
+                entry.save()
+                return entry.headlines
+            # Parsed as it arrives; the rest of the body is never downloaded.
+            headlines = parse_headlines(response.stream, limit)
+        entry.etag = response.etag
+        entry.last_modified = response.last_modified
+        entry.headlines = headlines
+        entry.save()
+        return headlines
+
+
+def resolve_many(
+    sources: Iterable[str],
+    limit: int = 1,
+    *,
+    client: FeedClient | None = None,
+    cache: FeedCache | None = None,
+    workers: int = BATCH_WORKERS,
+) -> list[FeedResult]:
+    """Resolve many feed URLs or files concurrently; results keep the input order."""
+    sources = list(sources)
+    client = client or default_client()
+
+    def resolve(source: str) -> FeedResult:
+        try:
+            return FeedResult(source, fetch_headlines(source, limit, client=client, cache=cache))
+        except HeadlineError as error:
+            return FeedResult(source, error=error)
+
+    if len(sources) <= 1:
+        return [resolve(source) for source in sources]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(sources))) as pool:
+        return list(pool.map(resolve, sources))
+
+
+def newest_first(results: Iterable[FeedResult], limit: int) -> list[Headline]:
+    """Merge result headlines newest first; undated ones sort last and ties keep input order."""
+    headlines = [headline for result in results for headline in result.headlines]
+    headlines.sort(key=lambda headline: headline.published.timestamp() if headline.published else 0.0, reverse=True)
+    return headlines[:limit]
+
+
+class _WatchedFeed:
+    """One followed feed: its own kept-alive client, cache validators and seen GUIDs."""
+
+    def __init__(self, url: str, top: int) -> None:
+        self.url = url
+        self.top = top
+        # Watch mode has its own backoff, so the client does not retry.
+        self.client = FeedClient(retries=0)
+        self.etag = ""
+        self.last_modified = ""
+        self.seen: OrderedDict[str, bool] = OrderedDict()
+        self.primed = False
+        self.failures = 0
+
+    def poll(self) -> list[Headline]:
+        with self.client.fetch(self.url, self.etag, self.last_modified) as response:
+            if response.moved:
+                self.url = response.url
+            if response.status == 304:
+                return []
+            items = parse_headlines(response.stream, None)
+            self.etag = response.etag
+            self.last_modified = response.last_modified
+        if self.primed:
+            # Feeds list newest first; new items come out oldest first so the stream reads in order.
+            fresh = [item for item in reversed(items) if item.guid not in self.seen]
+        else:
+            ranked = newest_first([FeedResult(self.url, items)], self.top)
+            fresh = list(reversed(ranked))
+            self.primed = True
+        # Oldest first, so eviction drops the oldest GUIDs; everything still in the feed is kept.
+        for item in reversed(items):
+            self.seen[item.guid] = True
+            self.seen.move_to_end(item.guid)
+        while len(self.seen) > max(WATCH_SEEN_LIMIT, len(items)):
+            self.seen.popitem(last=False)
+        return fresh
+
+
+def watch(
+    urls: Iterable[str],
+    *,
+    interval: float,
+    max_backoff: float,
+    top: int = 1,
+    emit: Callable[[str, Headline], None],
+    report: Callable[[str, HeadlineError], None],
+    stop: threading.Event,
+) -> None:
+    """Poll each feed in its own thread until ``stop`` is set.
+
+    ``emit`` gets every headline once: the ``top`` newest on the first poll,
+    then only unseen ones. Network and HTTP failures back off exponentially
+    with jitter up to ``max_backoff``; parse failures retry at ``interval``.
+    """
+
+    def follow(feed: _WatchedFeed) -> None:
+        while not stop.is_set():
+            try:
+                for headline in feed.poll():
+                    emit(feed.url, headline)
+                feed.failures = 0
+                delay = interval * random.uniform(0.9, 1.1)
+            except HeadlineError as error:
+                report(feed.url, error)
+                if isinstance(error, (FetchError, HTTPStatusError)):
+                    # Full jitter so failing feeds do not retry in lockstep.
+                    feed.failures += 1
+                    delay = random.uniform(0.5, 1.0) * min(max_backoff, interval * 2**feed.failures)
+                else:
+                    delay = interval
+            stop.wait(delay)
+        feed.client.close()
+
+    threads = [threading.Thread(target=follow, args=(_WatchedFeed(url, top),), daemon=True) for url in urls]
+    for thread in threads:
+        thread.start()
+    while not stop.is_set():
+        stop.wait(0.5)
+    for thread in threads:
+        thread.join(timeout=MAX_TIME_SECONDS)
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    def error(self, message: str) -> None:  # type: ignore[override]
+        print(f"ERROR: {message}", file=sys.stderr)
+        self.print_usage(sys.stderr)
+        sys.exit(2)
+
+
+def _positive_int(value: str) -> int:
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return int(value)
+
+
+def _positive_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not number > 0 or number == float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a positive number: {value}")
+    return number
+
+
+EPILOG = """\
+Environment:
+  NEWS_FEED_URL   Override RSS feed URL (default: {default_url})
+  NEWS_FEED_URLS  Whitespace-separated feed URLs, added to --feed
+  NEWS_WATCH_INTERVAL, NEWS_WATCH_MAX_BACKOFF
+                  Defaults for --interval and --max-backoff
+  NEWS_CACHE_DIR  Feed cache directory; empty disables the cache
+                  (default: ${{XDG_CACHE_HOME:-~/.cache}}/show_latest_headline)
+  NEWS_CACHE_TTL  Seconds a cached headline is served without any request;
+                  after that the feed is revalidated with ETag/Last-Modified (default: 60)
+
+Exit codes:
+  0   Success
+  2   Invalid arguments
+  10  Network / timeout error while fetching feed
+  11  HTTP error while fetching feed
+  20  Failed to parse feed response
+  21  No headline found in feed
+
+With several feeds (or --batch), failing feeds are reported with these codes;
+the exit code is 0 when any headline was resolved, otherwise the code of the
+first failing feed.
+"""
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = _ArgumentParser(
+        prog="show_latest_headline.sh",
+        description=(
+            "Fetch and print the latest headline title from an RSS/Atom feed, or the\n"
+            "newest headlines across several feeds fetched concurrently."
+        ),
+        epilog=EPILOG.format(default_url=os.getenv("NEWS_FEED_URL") or DEFAULT_FEED_URL),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--feed",
+        dest="feeds",
+        action="append",
+        default=[],
+        metavar="URL",
+        help="Add a feed (repeatable); feeds are fetched in parallel",
+    )
+    parser.add_argument(
+        "--file",
+        dest="files",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Add a local feed file (repeatable); same as --feed file://PATH",
+    )
+    parser.add_argument(
+        "--top",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Print the N newest headlines, newest first (default: 1)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help=(
+            "Also read feed URLs (file:// for local files) from stdin (one per line) and print "
+            "one JSON result per source, in input order"
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running and poll the feeds, printing each new headline once as a JSON line; "
+            "the first poll prints the --top newest per feed"
+        ),
+    )
+    parser.add_argument(
+        "--interval",
+        type=_positive_float,
+        default=os.getenv("NEWS_WATCH_INTERVAL", "60"),
+        metavar="SECONDS",
+        help="Seconds between polls in --watch mode (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-backoff",
+        type=_positive_float,
+        default=os.getenv("NEWS_WATCH_MAX_BACKOFF", "900"),
+        metavar="SECONDS",
+        help="Longest wait after repeated exit-10/11 failures (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    if args.watch and args.batch:
+        parser.error("--watch and --batch cannot be combined")
+    args.feeds += [Path(path).resolve().as_uri() for path in args.files]
+    args.feeds += os.getenv("NEWS_FEED_URLS", "").split()
+    ttl = os.getenv("NEWS_CACHE_TTL") or "60"
+    if not ttl.isdigit():
+        parser.error(f"NEWS_CACHE_TTL must be a non-negative integer: {ttl}")
+    args.cache_ttl = int(ttl)
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.getenv("HOME") or "/tmp", ".cache")
+    args.cache_dir = os.environ.get("NEWS_CACHE_DIR", os.path.join(cache_home, "show_latest_headline"))
+    return args
+
+
+def _print_line(text: str) -> bool:
+    try:
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        return False
+    return True
+
+
+def _report(url: str, error: HeadlineError) -> None:
+    print(f"ERROR: feed {url} failed (exit {error.exit_code}): {error}", file=sys.stderr, flush=True)
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    stop = threading.Event()
+    output_lock = threading.Lock()
+
+    def emit(url: str, headline: Headline) -> None:
+        with output_lock:
+            if not _print_line(json.dumps({"feed": url, **headline.to_dict()}, ensure_ascii=False)):
+                stop.set()
+
+    def report(url: str, error: HeadlineError) -> None:
+        with output_lock:
+            _report(url, error)
+
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    watch(
+        args.feeds or [os.getenv("NEWS_FEED_URL") or DEFAULT_FEED_URL],
+        interval=args.interval,
+        max_backoff=args.max_backoff,
+        top=args.top,
+        emit=emit,
+        report=report,
+        stop=stop,
+    )
+    return 0
+
+
+def _first_failure(results: list[FeedResult], resolved: bool) -> int:
+    if resolved:
+        return 0
+    return next((result.exit_code for result in results if result.error), 0)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.watch:
+        return run_watch(args)
+    cache = open_cache(args.cache_dir, args.cache_ttl)
+
+    if args.batch:
+        sources = args.feeds + [line.strip() for line in sys.stdin if line.strip() and not line.startswith("#")]
+        results = resolve_many(sources, args.top, cache=cache)
+        for result in results:
+            if not _print_line(json.dumps(result.to_dict(), ensure_ascii=False)):
+                break
+        return _first_failure(results, any(not result.error for result in results))
+
+    if not args.feeds and args.top == 1:
+        try:
+            headline = fetch_headlines(os.getenv("NEWS_FEED_URL") or DEFAULT_FEED_URL, cache=cache)[0]
+        except HeadlineError as error:
+            print(f"ERROR: {error}", file=sys.stderr)
+            return error.exit_code
+        _print_line(headline.title)
+        return 0
+
+    results = resolve_many(args.feeds or [os.getenv("NEWS_FEED_URL") or DEFAULT_FEED_URL], args.top, cache=cache)
+    for result in results:
+        if result.error:
+            _report(result.source, result.error)
+    headlines = newest_first(results, args.top)
+    for headline in headlines:
+        if not _print_line(headline.title):
+            break
+    return _first_failure(results, bool(headlines))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""Benchmark show_latest_headline.sh and headline.py against a local feed server."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+from urllib import parse
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CLI = SCRIPT_DIR / "show_latest_headline.sh"
+DEFAULT_SIZES = "1k,64k,1m,10m,50m"
+DEFAULT_FORMATS = "rss,atom"
+DEFAULT_CONCURRENCY = "1,4,16"
+DEFAULT_STATUSES = "404,500,503"
+# The slow-drip feed is sent at this many bytes per second, in ten writes per second.
+DRIP_SIZE = "64k"
+DRIP_BYTES_PER_SECOND = 16 * 1024
+SIZE_PATTERN = re.compile(r"^(\d+)([kmg]?)$")
+SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+FEED_PATH = re.compile(r"^/(feed|drip)/(rss|atom)/(\w+)$")
+STATUS_PATH = re.compile(r"^/status/(\d{3})$")
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# Latency differences below this are treated as noise by --compare.
+COMPARE_FLOOR_MS = 5.0
+# Runs JSON-encoded commands from stdin concurrently and answers on stdout with
+# exit code, wall time, output and the child's own peak RSS. A forked child
+# starts with its parent's RSS high-water mark, so commands are started from
+# this bare interpreter rather than from the benchmark holding every feed.
+SPAWNER_SOURCE = """
+import json, os, subprocess, sys, tempfile, threading, time
+
+write_lock = threading.Lock()
+
+
+def serve(request):
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        started = time.perf_counter()
+        process = subprocess.Popen(request["argv"], env=request["env"], stdout=out, stderr=err)
+        # The CLI wrapper execs python, so this rusage covers the whole run; ru_maxrss is KiB on Linux.
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        result = {
+            "id": request["id"],
+            "exit_code": process.returncode,
+            "wall_ms": wall * 1000,
+            "peak_rss_kib": usage.ru_maxrss,
+            "stdout": out.read().decode("utf-8", "replace").strip(),
+            "stderr": err.read().decode("utf-8", "replace").strip()[-500:],
+        }
+    with write_lock:
+        print(json.dumps(result), flush=True)
+
+
+threads = []
+for line in sys.stdin:
+    threads.append(threading.Thread(target=serve, args=(json.loads(line),)))
+    threads[-1].start()
+for thread in threads:
+    thread.join()
+"""
+
+sys.path.insert(0, str(SCRIPT_DIR))
+import headline  # noqa: E402
+
+
+def parse_size(value: str) -> int:
+    match = SIZE_PATTERN.match(value.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}")
+    return int(match.group(1)) * SIZE_UNITS[match.group(2)]
+
+
+def generate_feed(kind: str, size: int) -> bytes:
+    """Build an RSS or Atom feed of roughly ``size`` bytes, newest item first."""
+    padding = "lorem ipsum dolor sit amet " * 16
+    items: list[str] = []
+    total = 0
+    index = 0
+    while not items or total < size:
+        published = BASE_TIME - timedelta(minutes=index)
+        if kind == "rss":
+            item = (
+                f"<item><title>Headline {index}</title><guid>bench-{index}</guid>"
+                f"<pubDate>{format_datetime(published)}</pubDate>"
+                f"<description>{padding}</description></item>"
+            )
+        else:
+            item = (
+                f"<entry><title>Headline {index}</title><id>urn:bench:{index}</id>"
+                f"<updated>{published.isoformat()}</updated><summary>{padding}</summary></entry>"
+            )
+        items.append(item)
+        total += len(item)
+        index += 1
+    if kind == "rss":
+        document = f'<?xml version="1.0"?><rss version="2.0"><channel><title>bench</title>{"".join(items)}</channel></rss>'
+    else:
+        document = f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>bench</title>{"".join(items)}</feed>'
+    return document.encode("utf-8")
+
+
+class FeedServer:
+    """Synthetic feeds with ETags, slow-drip responses and error statuses, plus request counters."""
+
+    def __init__(self) -> None:
+        self.feeds: dict[tuple[str, int], bytes] = {}
+        self.requests: dict[str, int] = {}
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def feed(self, kind: str, size: int) -> bytes:
+        key = (kind, size)
+        with self.lock:
+            if key not in self.feeds:
+                self.feeds[key] = generate_feed(kind, size)
+            return self.feeds[key]
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+
+    def snapshot(self) -> tuple[int, dict[str, int]]:
+        with self.lock:
+            return self.connections, dict(self.requests)
+
+
+def make_handler(state: FeedServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, delayed ACKs add ~40ms per request.
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with state.lock:
+                state.connections += 1
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+        def handle(self) -> None:
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                # Clients that stop reading early may reset a kept-alive connection.
+                return
+
+        def do_GET(self) -> None:
+            target = parse.urlsplit(self.path)
+            match = FEED_PATH.match(target.path)
+            status = STATUS_PATH.match(target.path)
+            try:
+                if match:
+                    self.send_feed(match.group(1), match.group(2), match.group(3))
+                elif status:
+                    state.count("status")
+                    self.send_body(int(status.group(1)), b"error\n")
+                else:
+                    self.send_body(404, b"not found\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # The CLI stops reading once it has its headline.
+                self.close_connection = True
+
+        def send_feed(self, route: str, kind: str, size_name: str) -> None:
+            body = state.feed(kind, parse_size(size_name))
+            etag = f'"{kind}-{len(body)}"'
+            if route == "feed" and self.headers.get("If-None-Match") == etag:
+                state.count("304")
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            state.count(route)
+            if route == "feed":
+                self.send_body(200, body, {"ETag": etag, "Content-Type": "application/xml"})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            step = max(1, DRIP_BYTES_PER_SECOND // 10)
+            for offset in range(0, len(body), step):
+                self.wfile.write(body[offset : offset + step])
+                self.wfile.flush()
+                time.sleep(0.1)
+
+        def send_body(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+class Spawner:
+    """Client for the SPAWNER_SOURCE child; ``run`` is safe to call from several threads."""
+
+    def __init__(self) -> None:
+        self.process = subprocess.Popen(
+            [sys.executable, "-S", "-c", SPAWNER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.lock = threading.Lock()
+        self.pending: dict[int, tuple[threading.Event, list[dict[str, Any]]]] = {}
+        self.next_id = 0
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self) -> None:
+        assert self.process.stdout is not None
+        for line in self.process.stdout:
+            result = json.loads(line)
+            with self.lock:
+                done, slot = self.pending.pop(result.pop("id"))
+            slot.append(result)
+            done.set()
+
+    def run(self, argv: list[str], env: dict[str, str]) -> dict[str, Any]:
+        done = threading.Event()
+        slot: list[dict[str, Any]] = []
+        assert self.process.stdin is not None
+        with self.lock:
+            request_id = self.next_id
+            self.next_id += 1
+            self.pending[request_id] = (done, slot)
+            self.process.stdin.write(json.dumps({"id": request_id, "argv": argv, "env": env}) + "\n")
+            self.process.stdin.flush()
+        done.wait()
+        return slot[0]
+
+    def run_cli(self, env: dict[str, str]) -> dict[str, Any]:
+        return self.run([str(CLI)], env)
+
+    def close(self) -> None:
+        assert self.process.stdin is not None
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "min_ms": round(ordered[0], 2),
+    }
+
+
+def bench_cli_case(
+    spawner: Spawner, base_env: dict[str, str], url: str, mode: str, repeat: int, expect: str | int
+) -> dict[str, Any]:
+    """Time ``repeat`` CLI runs in one cache mode: cold, warm (cache hit), revalidate (304) or nocache."""
+    runs: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="headline-bench-") as cache_dir:
+        env = {**base_env, "NEWS_FEED_URL": url, "NEWS_CACHE_DIR": cache_dir}
+        if mode == "nocache":
+            env["NEWS_CACHE_DIR"] = ""
+        elif mode == "revalidate":
+            env["NEWS_CACHE_TTL"] = "0"
+        if mode in ("warm", "revalidate"):
+            spawner.run_cli(env)
+        for _ in range(repeat):
+            if mode == "cold":
+                for path in Path(cache_dir).iterdir():
+                    path.unlink()
+            runs.append(spawner.run_cli(env))
+    failures = [
+        run for run in runs if (run["exit_code"] != expect if isinstance(expect, int) else run["stdout"] != expect)
+    ]
+    result: dict[str, Any] = {
+        **summarize([run["wall_ms"] for run in runs]),
+        "runs": len(runs),
+        "peak_rss_kib": max(run["peak_rss_kib"] for run in runs),
+        "exit_codes": sorted({run["exit_code"] for run in runs}),
+        "ok": not failures,
+    }
+    if failures:
+        result["stderr"] = failures[0]["stderr"]
+    return result
+
+
+def timed(function: Callable[[], Any]) -> tuple[float, Any]:
+    started = time.perf_counter()
+    value = function()
+    return (time.perf_counter() - started) * 1000, value
+
+
+def bench_stages(url: str, repeat: int) -> dict[str, Any]:
+    """Split one in-process fetch into connect+headers, body download and parsing."""
+    samples: dict[str, list[float]] = {"fetch_ms": [], "download_ms": [], "parse_first_ms": [], "parse_all_ms": []}
+    for _ in range(repeat):
+        client = headline.FeedClient(retries=0)
+        fetch_ms, response = timed(lambda: client.fetch(url))
+        with response:
+            download_ms, body = timed(response.stream.read)
+        client.close()
+        parse_first_ms, _ = timed(lambda: headline.parse_headlines(body, 1))
+        parse_all_ms, _ = timed(lambda: headline.parse_headlines(body, None))
+        for name, value in (
+            ("fetch_ms", fetch_ms),
+            ("download_ms", download_ms),
+            ("parse_first_ms", parse_first_ms),
+            ("parse_all_ms", parse_all_ms),
+        ):
+            samples[name].append(value)
+    return {name: round(statistics.median(values), 2) for name, values in samples.items()}
+
+
+def bench_startup(spawner: Spawner, env: dict[str, str], repeat: int) -> dict[str, Any]:
+    """Fixed per-invocation costs: bash, the Python interpreter and importing headline.py."""
+
+    def wall(command: list[str]) -> float:
+        return statistics.median(spawner.run(command, env)["wall_ms"] for _ in range(repeat))
+
+    bash_ms = wall(["bash", "-c", ":"])
+    python_ms = wall(["python3", "-c", "pass"])
+    import_ms = wall(["python3", "-c", f"import sys; sys.path.insert(0, {str(SCRIPT_DIR)!r}); import headline"])
+    return {
+        "bash_ms": round(bash_ms, 2),
+        "python_ms": round(python_ms, 2),
+        "import_ms": round(max(0.0, import_ms - python_ms), 2),
+    }
+
+
+def bench_cli_concurrency(spawner: Spawner, base_env: dict[str, str], url: str, level: int) -> dict[str, Any]:
+    """Start ``level`` uncached CLI runs at once and measure throughput."""
+    env = {**base_env, "NEWS_FEED_URL": url, "NEWS_CACHE_DIR": ""}
+    results: list[dict[str, Any]] = [{} for _ in range(level)]
+
+    def worker(index: int) -> None:
+        results[index] = spawner.run_cli(env)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(level)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return {
+        **summarize([result["wall_ms"] for result in results]),
+        "wall_seconds": round(wall, 3),
+        "per_second": round(level / wall, 1),
+        "peak_rss_kib": max(result["peak_rss_kib"] for result in results),
+        "ok": all(result["exit_code"] == 0 for result in results),
+    }
+
+
+def bench_library_concurrency(url: str, level: int) -> dict[str, Any]:
+    """Resolve ``level`` sources with resolve_many in this interpreter."""
+    client = headline.FeedClient(retries=0)
+    sources = [f"{url}?n={index}" for index in range(level)]
+    # One warm-up pass opens the pooled connections, as a long-lived service would have them.
+    headline.resolve_many(sources, client=client)
+    wall_ms, results = timed(lambda: headline.resolve_many(sources, client=client))
+    client.close()
+    return {
+        "wall_seconds": round(wall_ms / 1000, 4),
+        "per_second": round(level / (wall_ms / 1000), 1),
+        "ok": all(result.error is None for result in results),
+    }
+
+
+def bench_library_latency(url: str, repeat: int) -> dict[str, Any]:
+    """Per-call latency of fetch_headlines on a kept-alive client, uncached and from a warm cache."""
+    client = headline.FeedClient(retries=0)
+    headline.fetch_headlines(url, client=client)
+    fetch = [timed(lambda: headline.fetch_headlines(url, client=client))[0] for _ in range(repeat)]
+    with tempfile.TemporaryDirectory(prefix="headline-bench-") as cache_dir:
+        cache = headline.FeedCache(cache_dir, ttl=3600)
+        headline.fetch_headlines(url, client=client, cache=cache)
+        cached = [timed(lambda: headline.fetch_headlines(url, client=client, cache=cache))[0] for _ in range(repeat)]
+    client.close()
+    return {
+        "fetch": summarize(fetch),
+        "cache_hit": summarize(cached),
+    }
+
+
+def bench_watch(state: FeedServer, base_env: dict[str, str], url: str, seconds: float) -> dict[str, Any]:
+    """Run --watch briefly: time to the first line, and requests/connections per poll afterwards."""
+    interval = 0.2
+    connections_before, requests_before = state.snapshot()
+    process = subprocess.Popen(
+        [str(CLI), "--watch", "--interval", str(interval), "--feed", url],
+        env=base_env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    started = time.perf_counter()
+    assert process.stdout is not None
+    first_line = process.stdout.readline()
+    first_line_ms = (time.perf_counter() - started) * 1000
+    time.sleep(seconds)
+    process.terminate()
+    process.wait(timeout=30)
+    connections_after, requests_after = state.snapshot()
+    polls = sum(requests_after.get(name, 0) - requests_before.get(name, 0) for name in ("feed", "304"))
+    return {
+        "first_line_ms": round(first_line_ms, 2),
+        "polls": polls,
+        "not_modified": requests_after.get("304", 0) - requests_before.get("304", 0),
+        "connections": connections_after - connections_before,
+        "ok": bool(first_line) and process.returncode == 0,
+    }
+
+
+def result_key(result: dict[str, Any]) -> str:
+    return "/".join(str(result[name]) for name in ("suite", "case", "mode") if name in result)
+
+
+def compare(results: list[dict[str, Any]], baseline_path: str, tolerance: float) -> list[str]:
+    """Return descriptions of median latencies that regressed beyond ``tolerance`` against a saved run."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    previous = {result_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if not old:
+            continue
+        for metric in ("median_ms", "first_line_ms"):
+            if metric not in result or metric not in old:
+                continue
+            new_value, old_value = result[metric], old[metric]
+            if new_value > old_value * (1 + tolerance) and new_value - old_value > COMPARE_FLOOR_MS:
+                regressions.append(f"{result_key(result)} {metric}: {old_value:.2f} -> {new_value:.2f}")
+    return regressions
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the headline CLI and library against a local feed server.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated feed sizes, e.g. 1k,1m,50m.")
+    parser.add_argument("--formats", default=DEFAULT_FORMATS, help="Comma-separated feed formats (rss, atom).")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; medians are reported.")
+    parser.add_argument(
+        "--concurrency", default=DEFAULT_CONCURRENCY, help="Comma-separated numbers of simultaneous invocations."
+    )
+    parser.add_argument("--statuses", default=DEFAULT_STATUSES, help="Comma-separated error statuses to time.")
+    parser.add_argument("--watch-seconds", type=float, default=2.0, help="How long to run --watch (0 skips it).")
+    parser.add_argument("--json", default="", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", default="", help="Earlier --json output; exit 1 when medians regress.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed relative slowdown for --compare (default: 0.25)."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    sizes = [item.strip() for item in args.sizes.split(",") if item.strip()]
+    for size in sizes:
+        parse_size(size)
+    formats = [item.strip() for item in args.formats.split(",") if item.strip()]
+    # Keep the benchmark off any configured proxy and away from the user's cache and feed settings.
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+    env = {key: value for key, value in os.environ.items() if not key.startswith("NEWS_")}
+
+    # Started before any feed is generated, so it stays small.
+    spawner = Spawner()
+    state = FeedServer()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    results: list[dict[str, Any]] = []
+
+    def record(result: dict[str, Any], line: str) -> None:
+        results.append(result)
+        print(line, flush=True)
+        if not result.get("ok", True):
+            print(f"  unexpected result: {result.get('stderr') or result.get('exit_codes')}", file=sys.stderr)
+
+    try:
+        startup = bench_startup(spawner, env, args.repeat)
+        record(
+            {"suite": "startup", **startup},
+            f"startup  bash={startup['bash_ms']:.1f}ms python={startup['python_ms']:.1f}ms "
+            f"import={startup['import_ms']:.1f}ms",
+        )
+        for kind in formats:
+            for size in sizes:
+                case = f"{kind}-{size}"
+                url = f"{base}/feed/{kind}/{size}"
+                stages = bench_stages(url, args.repeat)
+                record(
+                    {"suite": "stages", "case": case, **stages},
+                    f"stages   {case:<10} "
+                    + " ".join(f"{name[:-3]}={value:.1f}ms" for name, value in stages.items()),
+                )
+                for mode in ("cold", "warm", "revalidate", "nocache"):
+                    result = bench_cli_case(spawner, env, url, mode, args.repeat, "Headline 0")
+                    record(
+                        {"suite": "cli", "case": case, "mode": mode, **result},
+                        f"cli      {case:<10} {mode:<10} median={result['median_ms']:.1f}ms "
+                        f"p95={result['p95_ms']:.1f}ms rss={result['peak_rss_kib'] / 1024:.1f}MiB",
+                    )
+
+        drip_url = f"{base}/drip/rss/{DRIP_SIZE}"
+        for mode in ("cold", "nocache"):
+            # Without the cache the CLI stops reading after the first item; with it the whole body is spooled.
+            result = bench_cli_case(spawner, env, drip_url, mode, 1, "Headline 0")
+            record(
+                {"suite": "cli", "case": f"drip-{DRIP_SIZE}", "mode": mode, **result},
+                f"cli      drip-{DRIP_SIZE:<5} {mode:<10} median={result['median_ms']:.1f}ms",
+            )
+        for status in [int(item) for item in args.statuses.split(",") if item.strip()]:
+            result = bench_cli_case(spawner, env, f"{base}/status/{status}", "nocache", 1, 11)
+            record(
+                {"suite": "cli", "case": f"status-{status}", "mode": "nocache", **result},
+                f"cli      status-{status:<3} nocache    median={result['median_ms']:.1f}ms exit={result['exit_codes']}",
+            )
+
+        latency_url = f"{base}/feed/rss/{sizes[0]}"
+        library = bench_library_latency(latency_url, max(args.repeat, 20))
+        for mode, summary in library.items():
+            record(
+                {"suite": "library", "case": f"rss-{sizes[0]}", "mode": mode, **summary},
+                f"library  rss-{sizes[0]:<6} {mode:<10} median={summary['median_ms']:.2f}ms",
+            )
+        for level in [int(item) for item in args.concurrency.split(",") if item.strip()]:
+            cli = bench_cli_concurrency(spawner, env, latency_url, level)
+            record(
+                {"suite": "concurrency", "case": f"cli-{level}", **cli},
+                f"parallel cli-{level:<6} {cli['per_second']:>8.1f}/s median={cli['median_ms']:.1f}ms "
+                f"rss={cli['peak_rss_kib'] / 1024:.1f}MiB",
+            )
+            lib = bench_library_concurrency(latency_url, level)
+            record(
+                {"suite": "concurrency", "case": f"library-{level}", **lib},
+                f"parallel library-{level:<2} {lib['per_second']:>8.1f}/s",
+            )
+        if args.watch_seconds > 0:
+            watched = bench_watch(state, env, latency_url, args.watch_seconds)
+            record(
+                {"suite": "watch", "case": f"rss-{sizes[0]}", **watched},
+                f"watch    rss-{sizes[0]:<6} first_line={watched['first_line_ms']:.1f}ms polls={watched['polls']} "
+                f"304={watched['not_modified']} connections={watched['connections']}",
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+        spawner.close()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"results": results}, indent=2), encoding="utf-8")
+    status = 0 if all(result.get("ok", True) for result in results) else 1
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))